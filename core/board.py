@@ -1,12 +1,40 @@
-from core.piece import Piece, PieceType, Color
+from core.piece import PIECES, Piece, PieceType, Color
 from core.move import Move
+from core.zobrist import PIECE_KEYS
+from core.psqt import MG_TABLE, EG_TABLE, PHASE_TABLE
+
+# Castling rights bitmask (also used to index Zobrist castling keys)
+WHITE_KINGSIDE = 1
+WHITE_QUEENSIDE = 2
+BLACK_KINGSIDE = 4
+BLACK_QUEENSIDE = 8
+ALL_CASTLING = 15
+
+# Rights kept by a move touching each square (row * 8 + col): moving the king or a
+# rook, or capturing on a rook's corner, loses the matching rights for good
+CASTLING_MASKS = [ALL_CASTLING] * 64
+for _square, _lost in ((60, WHITE_KINGSIDE | WHITE_QUEENSIDE), (63, WHITE_KINGSIDE), (56, WHITE_QUEENSIDE),
+                       (4, BLACK_KINGSIDE | BLACK_QUEENSIDE), (7, BLACK_KINGSIDE), (0, BLACK_QUEENSIDE)):
+    CASTLING_MASKS[_square] = ALL_CASTLING & ~_lost
+
+KNIGHT_OFFSETS = [(2, 1), (1, 2), (-1, 2), (-2, 1), (-2, -1), (-1, -2), (1, -2), (2, -1)]
+KING_OFFSETS = [(1, 0), (1, 1), (0, 1), (-1, 1), (-1, 0), (-1, -1), (0, -1), (1, -1)]
+DIAGONAL_DIRECTIONS = [(1, 1), (-1, -1), (1, -1), (-1, 1)]
+STRAIGHT_DIRECTIONS = [(0, 1), (0, -1), (1, 0), (-1, 0)]
 
 class Board:
+    __slots__ = (
+        'grid', 'en_passant_target', 'castling', 'king_squares',
+        'mg_score', 'eg_score', 'phase', 'piece_hash', 'piece_counts',
+    )
+
     def __init__(self):
         self.grid = [[None for _ in range(8)] for _ in range(8)]
         self.setup_position()
         self.en_passant_target = None
-        
+        self.castling = ALL_CASTLING  # castling rights bitmask
+        self.refresh_scores()
+
     def setup_position(self):
         # Set up pawns
         for col in range(8):
@@ -23,6 +51,64 @@ class Board:
             self.grid[0][col] = Piece(Color.BLACK, piece_type)
             self.grid[7][col] = Piece(Color.WHITE, piece_type)
 
+    # --- Compact mailbox: one byte per square (row * 8 + col), 0 for empty, else piece index + 1 ---
+    def to_mailbox(self) -> bytearray:
+        mailbox = bytearray(64)
+        for row in range(8):
+            for col, piece in enumerate(self.grid[row]):
+                if piece:
+                    mailbox[row * 8 + col] = piece.index + 1
+        return mailbox
+
+    @classmethod
+    def from_mailbox(cls, mailbox, castling=0, en_passant_target=None) -> "Board":
+        board = cls.__new__(cls)
+        board.grid = [[PIECES[code - 1] if code else None for code in mailbox[row * 8:row * 8 + 8]] for row in range(8)]
+        board.castling = castling
+        board.en_passant_target = en_passant_target
+        board.refresh_scores()
+        return board
+
+    # --- Incremental terms: material + piece-square (midgame/endgame), phase,
+    # piece counts (by core.zobrist.piece_index), king squares and the Zobrist key of the pieces ---
+    def refresh_scores(self):
+        # Recompute from scratch; needed after writing to grid directly
+        self.mg_score = self.eg_score = self.phase = 0
+        self.piece_hash = 0
+        self.piece_counts = [0] * 12
+        self.king_squares = {}
+        for row in range(8):
+            for col in range(8):
+                piece = self.grid[row][col]
+                if piece:
+                    self._add_scores(piece, row, col)
+                    if piece.type == PieceType.KING:
+                        self.king_squares[piece.color] = (row, col)
+
+    def _add_scores(self, piece: Piece, row: int, col: int):
+        index = piece.index
+        square = index * 64 + row * 8 + col
+        self.mg_score += MG_TABLE[square]
+        self.eg_score += EG_TABLE[square]
+        self.phase += PHASE_TABLE[index]
+        self.piece_hash ^= PIECE_KEYS[index][row * 8 + col]
+        self.piece_counts[index] += 1
+
+    def _remove_scores(self, piece: Piece, row: int, col: int):
+        index = piece.index
+        square = index * 64 + row * 8 + col
+        self.mg_score -= MG_TABLE[square]
+        self.eg_score -= EG_TABLE[square]
+        self.phase -= PHASE_TABLE[index]
+        self.piece_hash ^= PIECE_KEYS[index][row * 8 + col]
+        self.piece_counts[index] -= 1
+
+    def insufficient_material(self) -> bool:
+        # Bare kings, or a single knight or bishop against a bare king
+        counts = self.piece_counts
+        pawns_and_majors = counts[0] + counts[1] + sum(counts[6:10])
+        return not pawns_and_majors and sum(counts[2:6]) <= 1
+
     def get_piece_at(self, pos: tuple[int, int]):
         row, col = pos
         return self.grid[row][col]
@@ -31,6 +117,10 @@ class Board:
         fr, to = move.from_pos, move.to_pos
         piece = move.piece
 
+        self._remove_scores(piece, *fr)
+        if move.captured:
+            self._remove_scores(move.captured, *move.captured_pos)
+
         # En Passant
         if move.captured and self.grid[to[0]][to[1]] is None and move.captured_pos != to:
             self.grid[move.captured_pos[0]][move.captured_pos[1]] = None
@@ -38,29 +128,45 @@ class Board:
         # Promotion
         if move.promotion:
             promoted_piece = Piece(piece.color, move.promotion)
-            promoted_piece.has_moved = True
             self.grid[to[0]][to[1]] = promoted_piece
+            self._add_scores(promoted_piece, *to)
         else:
             self.grid[to[0]][to[1]] = piece
+            self._add_scores(piece, *to)
 
         self.grid[fr[0]][fr[1]] = None
-        piece.has_moved = True
+
+        # Castling: bring the rook across as well
+        if move.castling:
+            row = fr[0]
+            rook_from_col, rook_to_col = (7, 5) if to[1] == 6 else (0, 3)
+            rook = self.grid[row][rook_from_col]
+            if rook:
+                self.grid[row][rook_to_col] = rook
+                self.grid[row][rook_from_col] = None
+                self._remove_scores(rook, row, rook_from_col)
+                self._add_scores(rook, row, rook_to_col)
+
+        move.prev_castling = self.castling
+        self.castling &= CASTLING_MASKS[fr[0] * 8 + fr[1]] & CASTLING_MASKS[to[0] * 8 + to[1]]
+        if piece.type == PieceType.KING:
+            self.king_squares[piece.color] = to
 
     def undo_move(self, move: Move):
         fr, to = move.from_pos, move.to_pos
 
-        # Undo promotion
-        if move.promotion:
-            self.grid[fr[0]][fr[1]] = Piece(move.piece.color, PieceType.PAWN)
-        else:
-            self.grid[fr[0]][fr[1]] = move.piece
+        self._remove_scores(self.grid[to[0]][to[1]], *to)
+        self._add_scores(move.piece, *fr)
 
+        # move.piece is still the pawn for promotions
+        self.grid[fr[0]][fr[1]] = move.piece
         self.grid[to[0]][to[1]] = None
 
         # Restore captured piece (normal or en passant)
         if move.captured:
             cap_row, cap_col = move.captured_pos
             self.grid[cap_row][cap_col] = move.captured
+            self._add_scores(move.captured, cap_row, cap_col)
 
         # Undo castling
         if move.castling:
@@ -70,16 +176,19 @@ class Board:
                 if rook:
                     self.grid[row][7] = rook
                     self.grid[row][5] = None
-                    rook.has_moved = False
+                    self._remove_scores(rook, row, 5)
+                    self._add_scores(rook, row, 7)
             elif to[1] == 2:  # Queenside
                 rook = self.grid[row][3]
                 if rook:
                     self.grid[row][0] = rook
                     self.grid[row][3] = None
-                    rook.has_moved = False
+                    self._remove_scores(rook, row, 3)
+                    self._add_scores(rook, row, 0)
 
-        # Reset the piece's movement state (except for kingside/queenside rook already handled above)
-        move.piece.has_moved = False
+        self.castling = move.prev_castling
+        if move.piece.type == PieceType.KING:
+            self.king_squares[move.piece.color] = fr
 
     def generate_pseudo_legal_moves(self, color: Color) -> list[Move]:
         moves = []
@@ -204,7 +313,8 @@ class Board:
                     moves.append(Move(pos, (new_row, new_col), piece, captured=target))
 
         # 🏰 Castling (simplified - assumes legality checked via filtering)
-        if not piece.has_moved and (row, col) == (7, 4) or (row, col) == (0, 4):
+        home = (7, 4) if piece.color == Color.WHITE else (0, 4)
+        if (row, col) == home:
             # Kingside
             if self._can_castle_kingside(piece.color):
                 moves.append(Move(pos, (row, 6), piece, castling=True))  # e1 → g1 or e8 → g8
@@ -214,19 +324,18 @@ class Board:
         return moves
 
     def find_king(self, color: Color) -> tuple[int, int] | None:
-        for row in range(8):
-            for col in range(8):
-                piece = self.grid[row][col]
-                if piece and piece.type == PieceType.KING and piece.color == color:
-                    return (row, col)
-        return None
+        return self.king_squares.get(color)
+
+    def castling_rights(self) -> int:
+        return self.castling
 
     def _can_castle_kingside(self, color: Color) -> bool:
         row = 7 if color == Color.WHITE else 0
-        king = self.grid[row][4]
         rook = self.grid[row][7]
 
-        if not rook or rook.type != PieceType.ROOK or rook.color != color or rook.has_moved:
+        if not self.castling & (WHITE_KINGSIDE if color == Color.WHITE else BLACK_KINGSIDE):
+            return False
+        if not rook or rook.type != PieceType.ROOK or rook.color != color:
             return False
         if self.grid[row][5] or self.grid[row][6]:  # f1/g1 or f8/g8
             return False
@@ -234,17 +343,52 @@ class Board:
 
     def _can_castle_queenside(self, color: Color) -> bool:
         row = 7 if color == Color.WHITE else 0
-        king = self.grid[row][4]
         rook = self.grid[row][0]
 
-        if not rook or rook.type != PieceType.ROOK or rook.color != color or rook.has_moved:
+        if not self.castling & (WHITE_QUEENSIDE if color == Color.WHITE else BLACK_QUEENSIDE):
+            return False
+        if not rook or rook.type != PieceType.ROOK or rook.color != color:
             return False
         if self.grid[row][1] or self.grid[row][2] or self.grid[row][3]:  # b1/c1/d1 or b8/c8/d8
             return False
         return not self._squares_under_attack(color, [(row, 4), (row, 3), (row, 2)])
 
     def _squares_under_attack(self, color: Color, squares: list[tuple[int, int]]) -> bool:
+        # Uses a direct attack test rather than enemy move generation, which would
+        # recurse back into castling checks when both kings are still at home.
         enemy_color = Color.BLACK if color == Color.WHITE else Color.WHITE
-        enemy_moves = self.generate_pseudo_legal_moves(enemy_color)
-        attacked = set(move.to_pos for move in enemy_moves)
-        return any(square in attacked for square in squares)
+        return any(self.is_square_attacked(square, enemy_color) for square in squares)
+
+    def is_square_attacked(self, pos: tuple[int, int], by_color: Color) -> bool:
+        row, col = pos
+
+        # Pawns attack diagonally towards the opponent
+        pawn_row = row + (1 if by_color == Color.WHITE else -1)
+        if 0 <= pawn_row < 8:
+            for dc in [-1, 1]:
+                c = col + dc
+                if 0 <= c < 8:
+                    p = self.grid[pawn_row][c]
+                    if p and p.color == by_color and p.type == PieceType.PAWN:
+                        return True
+
+        for offsets, piece_type in ((KNIGHT_OFFSETS, PieceType.KNIGHT), (KING_OFFSETS, PieceType.KING)):
+            for dr, dc in offsets:
+                r, c = row + dr, col + dc
+                if 0 <= r < 8 and 0 <= c < 8:
+                    p = self.grid[r][c]
+                    if p and p.color == by_color and p.type == piece_type:
+                        return True
+
+        for directions, slider in ((DIAGONAL_DIRECTIONS, PieceType.BISHOP), (STRAIGHT_DIRECTIONS, PieceType.ROOK)):
+            for dr, dc in directions:
+                r, c = row + dr, col + dc
+                while 0 <= r < 8 and 0 <= c < 8:
+                    p = self.grid[r][c]
+                    if p:
+                        if p.color == by_color and p.type in (slider, PieceType.QUEEN):
+                            return True
+                        break
+                    r += dr
+                    c += dc
+        return False
@@ -8,9 +8,6 @@ def move_to_pgn(move: Move) -> str:
     from_row, from_col = move.from_pos
     to_row, to_col = move.to_pos
 
-    # Promotion
-    promo = f"={move.promotion.name[0].upper()}" if move.promotion else ""
-
     # Castling
     if move.piece.type.name == "KING" and abs(from_col - to_col) == 2:
         return "O-O" if to_col == 6 else "O-O-O"
@@ -27,6 +24,9 @@ def move_to_pgn(move: Move) -> str:
 
     symbol = piece_symbols[move.piece.type.name]
 
+    # Promotion
+    promo = f"={piece_symbols[move.promotion.name]}" if move.promotion else ""
+
     # Pawn captures (e.g., exd5)
     if move.piece.type.name == "PAWN" and move.captured:
         symbol = cols[from_col]
@@ -35,3 +35,41 @@ def move_to_pgn(move: Move) -> str:
     dest = f"{cols[to_col]}{rows[to_row]}"
 
     return f"{symbol}{capture}{dest}{promo}"
+
+
+def move_to_san(move: Move, game_state) -> str:
+    # Full SAN for a legal move in the current position: adds the file/rank needed to
+    # tell identical pieces apart and the +/# suffix, which move_to_pgn leaves out.
+    san = move_to_pgn(move)
+    if move.piece.type.name not in ("PAWN", "KING"):
+        rivals = [
+            m.from_pos for m in game_state.get_all_legal_moves()
+            if m.to_pos == move.to_pos and m.from_pos != move.from_pos
+            and m.piece.type == move.piece.type
+        ]
+        if rivals:
+            from_row, from_col = move.from_pos
+            if all(col != from_col for _, col in rivals):
+                hint = "abcdefgh"[from_col]
+            elif all(row != from_row for row, _ in rivals):
+                hint = "87654321"[from_row]
+            else:
+                hint = "abcdefgh"[from_col] + "87654321"[from_row]
+            san = san[0] + hint + san[1:]
+
+    game_state.push_move(move)
+    if game_state.is_in_check(game_state.current_turn):
+        san += "#" if not game_state.get_all_legal_moves() else "+"
+    game_state.pop_move(move)
+    return san
+
+
+def line_to_san(game_state, moves) -> list[str]:
+    # SAN for a sequence of moves played from the current position (e.g. a principal variation)
+    sans = []
+    for move in moves:
+        sans.append(move_to_san(move, game_state))
+        game_state.push_move(move)
+    for move in reversed(moves):
+        game_state.pop_move(move)
+    return sans
@@ -0,0 +1,109 @@
+from core.board import Board, WHITE_KINGSIDE, WHITE_QUEENSIDE, BLACK_KINGSIDE, BLACK_QUEENSIDE
+from core.game_state import GameState
+from core.piece import Piece, PieceType, Color
+
+FEN_PIECES = {
+    'p': PieceType.PAWN,
+    'n': PieceType.KNIGHT,
+    'b': PieceType.BISHOP,
+    'r': PieceType.ROOK,
+    'q': PieceType.QUEEN,
+    'k': PieceType.KING,
+}
+
+START_FEN = "rnbqkbnr/pppppppp/8/8/8/8/PPPPPPPP/RNBQKBNR w KQkq - 0 1"
+
+def game_from_fen(fen: str) -> GameState:
+    # Raises ValueError for anything that does not describe a position
+    fields = fen.split()
+    if not fields:
+        raise ValueError("Empty FEN")
+    placement = fields[0]
+    turn = fields[1] if len(fields) > 1 else 'w'
+    castling = fields[2] if len(fields) > 2 else '-'
+    en_passant = fields[3] if len(fields) > 3 else '-'
+    halfmove = int(fields[4]) if len(fields) > 4 else 0
+    if turn not in ('w', 'b'):
+        raise ValueError(f"Invalid side to move: {turn}")
+    if castling != '-' and not set(castling) <= set('KQkq'):
+        raise ValueError(f"Invalid castling field: {castling}")
+    if en_passant != '-' and not (len(en_passant) == 2 and en_passant[0] in 'abcdefgh' and en_passant[1] in '36'):
+        raise ValueError(f"Invalid en passant square: {en_passant}")
+    if halfmove < 0:
+        raise ValueError(f"Invalid halfmove clock: {halfmove}")
+
+    ranks = placement.split('/')
+    if len(ranks) != 8:
+        raise ValueError(f"Expected 8 ranks, got {len(ranks)}")
+    board = Board()
+    board.grid = [[None for _ in range(8)] for _ in range(8)]
+    for row, rank in enumerate(ranks):
+        col = 0
+        for ch in rank:
+            if ch in '12345678':
+                col += int(ch)
+                continue
+            if ch.lower() not in FEN_PIECES:
+                raise ValueError(f"Invalid piece: {ch}")
+            if col >= 8:
+                raise ValueError(f"Rank {8 - row} has more than 8 squares: {rank}")
+            color = Color.WHITE if ch.isupper() else Color.BLACK
+            board.grid[row][col] = Piece(color, FEN_PIECES[ch.lower()])
+            col += 1
+        if col != 8:
+            raise ValueError(f"Rank {8 - row} does not have 8 squares: {rank}")
+
+    for color in (Color.WHITE, Color.BLACK):
+        kings = sum(piece is Piece(color, PieceType.KING) for rank in board.grid for piece in rank)
+        if kings != 1:
+            raise ValueError(f"Expected one {color.name.lower()} king, got {kings}")
+
+    # Only keep rights whose king and rook are still on their home squares
+    board.castling = 0
+    for flag, bit, color, row, rook_col in (
+        ('K', WHITE_KINGSIDE, Color.WHITE, 7, 7), ('Q', WHITE_QUEENSIDE, Color.WHITE, 7, 0),
+        ('k', BLACK_KINGSIDE, Color.BLACK, 0, 7), ('q', BLACK_QUEENSIDE, Color.BLACK, 0, 0),
+    ):
+        king, rook = board.grid[row][4], board.grid[row][rook_col]
+        if flag in castling and king is Piece(color, PieceType.KING) and rook is Piece(color, PieceType.ROOK):
+            board.castling |= bit
+    board.refresh_scores()
+
+    game = GameState(board)
+    game.current_turn = Color.WHITE if turn == 'w' else Color.BLACK
+    game.halfmove_clock = halfmove
+    if en_passant != '-':
+        game.en_passant_target = game.algebraic_to_coords(en_passant)
+    board.en_passant_target = game.en_passant_target
+    game.reset_hash_stack()
+    return game
+
+def game_to_fen(game_state) -> str:
+    board = game_state.board
+    ranks = []
+    for row in board.grid:
+        rank = ""
+        empty = 0
+        for piece in row:
+            if piece is None:
+                empty += 1
+                continue
+            if empty:
+                rank += str(empty)
+                empty = 0
+            rank += piece.symbol()
+        if empty:
+            rank += str(empty)
+        ranks.append(rank)
+
+    rights = board.castling_rights()
+    castling = ''.join(flag for bit, flag in (
+        (WHITE_KINGSIDE, 'K'), (WHITE_QUEENSIDE, 'Q'), (BLACK_KINGSIDE, 'k'), (BLACK_QUEENSIDE, 'q')
+    ) if rights & bit) or '-'
+    en_passant = '-'
+    if game_state.en_passant_target:
+        row, col = game_state.en_passant_target
+        en_passant = f"{chr(col + ord('a'))}{8 - row}"
+    turn = 'w' if game_state.current_turn == Color.WHITE else 'b'
+    fullmove = len(game_state.move_history) // 2 + 1
+    return f"{'/'.join(ranks)} {turn} {castling} {en_passant} {game_state.halfmove_clock} {fullmove}"
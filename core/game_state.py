@@ -1,8 +1,10 @@
+import re
 from core.export import move_to_pgn
 from core.pgn import load_pgn
 from core.piece import Color, PieceType
 from core.move import Move
 from core.board import Board
+from core.zobrist import CASTLING_KEYS, EN_PASSANT_KEYS, SIDE_KEY
 
 class GameState:
     def __init__(self, board: Board):
@@ -11,31 +13,72 @@ class GameState:
         self.move_history = []
         self.en_passant_target = None  # e.g., (3, 4) after e2e4
         self.halfmove_clock = 0
-        self.position_history = {}
         self.move_history = []
         self.redo_stack = []  # 🔁 for redo support
+        self.state_stack = []  # (en_passant_target, halfmove_clock) saved by push_move
+        self.reset_hash_stack()
+
+    def reset_hash_stack(self):
+        # Zobrist key of every position reached, pushed/popped with the moves.
+        # Call after setting up a position by hand (FEN, PGN replay).
+        self.hash_stack = [self.zobrist_key()]
+
+    # --- Draw and Game-End Detection ---
+    def is_repetition(self, ply=0) -> bool:
+        # Only positions since the last pawn move or capture can repeat, and only every
+        # other one has the same side to move. `ply` is the distance from the search root:
+        # repeating a position from inside the search tree is scored as a draw at once,
+        # one from the game before the root must already have occurred twice (threefold).
+        key = self.hash_stack[-1]
+        window = min(self.halfmove_clock, len(self.hash_stack) - 1)
+        seen = 0
+        for back in range(4, window + 1, 2):
+            if self.hash_stack[-1 - back] == key:
+                if back < ply:
+                    return True
+                seen += 1
+                if seen >= 2:
+                    return True
+        return False
 
-    def is_game_over(self) -> bool:
-        # 50-move rule
-        if self.halfmove_clock >= 100:
-            print("Draw by 50-move rule.")
+    def is_draw(self, ply=0) -> bool:
+        # Cheap draw test for search nodes (stalemate is found by move generation).
+        # A mate delivered on the hundredth half-move still wins, as in game_result().
+        if self.halfmove_clock >= 100 and not self.is_checkmate():
             return True
+        return self.board.insufficient_material() or self.is_repetition(ply)
 
-        # Threefold repetition
-        for pos, count in self.position_history.items():
-            if count >= 3:
-                print("Draw by threefold repetition.")
-                return True
+    def is_checkmate(self) -> bool:
+        return self.is_in_check(self.current_turn) and not self.get_all_legal_moves()
 
-        legal_moves = self.get_all_legal_moves()
-        if legal_moves:
+    def game_result(self) -> tuple[str, str] | None:
+        # ("1-0" / "0-1" / "1/2-1/2", reason) once the game has ended, otherwise None
+        if not self.get_all_legal_moves():
+            if self.is_in_check(self.current_turn):
+                return ("0-1" if self.current_turn == Color.WHITE else "1-0"), "checkmate"
+            return "1/2-1/2", "stalemate"
+        if self.halfmove_clock >= 100:
+            return "1/2-1/2", "fifty-move rule"
+        if self.is_repetition():
+            return "1/2-1/2", "threefold repetition"
+        if self.board.insufficient_material():
+            return "1/2-1/2", "insufficient material"
+        return None
+
+    def is_game_over(self) -> bool:
+        outcome = self.game_result()
+        if outcome is None:
             return False  # Game continues
 
-        if self.is_in_check(self.current_turn):
+        reason = outcome[1]
+        if reason == "checkmate":
             print(f"Checkmate! {self.current_turn.name} is checkmated.")
-        else:
+        elif reason == "stalemate":
             print("Stalemate!")
-
+        elif reason == "fifty-move rule":
+            print("Draw by 50-move rule.")
+        else:
+            print(f"Draw by {reason}.")
         return True
 
     def is_valid_input_format(self, move_str: str) -> bool:
@@ -58,67 +101,65 @@ class GameState:
         if not silent:
             print(f"🧩 move applied: {move}")
         self.board.en_passant_target = self.en_passant_target
-        legal_moves = self.get_all_legal_moves()
-        if not any(self._moves_equal(move, legal_move) for legal_move in legal_moves):
+        matches = [m for m in self.get_all_legal_moves() if self._moves_equal(move, m)]
+        if not matches:
             return False, "Illegal move."
 
-        self.en_passant_target = None
+        # Detect promotion
+        if matches[0].promotion and move.promotion is None:
+            from ui.cli import ask_promotion_choice
+            choice = ask_promotion_choice()
+            move.promotion = {
+                'q': PieceType.QUEEN,
+                'r': PieceType.ROOK,
+                'b': PieceType.BISHOP,
+                'n': PieceType.KNIGHT
+            }.get(choice, PieceType.QUEEN)  # Default to queen
+
+        # Play the generated move: it carries the castling / en passant details
+        move = next((m for m in matches if m.promotion == move.promotion), matches[0])
+        self.push_move(move)
+        if record:
+            self.move_history.append(move)
+            self.redo_stack.clear()  # Any new move invalidates future redos
+
+        return True, "ok"
+    
+    def push_move(self, move: Move):
+        # Lightweight make for search: the move must come from get_all_legal_moves(),
+        # nothing is validated, recorded in history or asked of the user.
+        self.state_stack.append((self.en_passant_target, self.halfmove_clock))
 
-        # Reset or increment 50-move clock
+        self.en_passant_target = None
         if move.piece.type == PieceType.PAWN:
             self.halfmove_clock = 0
-
-            # En passant target
-            r1, _ = move.from_pos
-            r2, _ = move.to_pos
-            if abs(r2 - r1) == 2:
-                row = (r1 + r2) // 2
-                col = move.from_pos[1]
-                self.en_passant_target = (row, col)
-
-            # Detect promotion
-            promotion_row = 0 if move.piece.color == Color.WHITE else 7
-            if r2 == promotion_row:
-                from ui.cli import ask_promotion_choice
-                choice = ask_promotion_choice()
-                move.promotion = {
-                    'q': PieceType.QUEEN,
-                    'r': PieceType.ROOK,
-                    'b': PieceType.BISHOP,
-                    'n': PieceType.KNIGHT
-                }.get(choice, PieceType.QUEEN)  # Default to queen
-
+            if abs(move.to_pos[0] - move.from_pos[0]) == 2:
+                self.en_passant_target = ((move.from_pos[0] + move.to_pos[0]) // 2, move.from_pos[1])
         elif move.captured:
             self.halfmove_clock = 0
         else:
             self.halfmove_clock += 1
 
         self.board.apply_move(move)
-        if record:
-            self.move_history.append(move)
-            key = self._position_key()
-            self.position_history[key] = self.position_history.get(key, 0) + 1
-            self.redo_stack.clear()  # Any new move invalidates future redos
+        self.board.en_passant_target = self.en_passant_target
+        self.current_turn = Color.BLACK if self.current_turn == Color.WHITE else Color.WHITE
+        self.hash_stack.append(self.zobrist_key())
 
+    def pop_move(self, move: Move):
+        self.board.undo_move(move)
+        self.en_passant_target, self.halfmove_clock = self.state_stack.pop()
+        self.board.en_passant_target = self.en_passant_target
         self.current_turn = Color.BLACK if self.current_turn == Color.WHITE else Color.WHITE
+        self.hash_stack.pop()
 
-        return True, "ok"
-    
-    def _position_key(self) -> str:
-        def piece_repr(piece):
-            if piece is None:
-                return "."
-            symbol = piece.type.name[0]
-            return symbol.upper() if piece.color == Color.WHITE else symbol.lower()
-
-        rows = []
-        for row in self.board.grid:
-            rows.append(''.join(piece_repr(p) for p in row))
-
-        board_str = '/'.join(rows)
-        turn_str = self.current_turn.name
-        ep_str = f"{self.en_passant_target}" if self.en_passant_target else "-"
-        return f"{board_str} {turn_str} {ep_str}"
+    def zobrist_key(self) -> int:
+        # Same value as core.zobrist.compute_hash, built from the board's incremental piece key
+        key = self.board.piece_hash ^ CASTLING_KEYS[self.board.castling_rights()]
+        if self.en_passant_target:
+            key ^= EN_PASSANT_KEYS[self.en_passant_target[1]]
+        if self.current_turn == Color.BLACK:
+            key ^= SIDE_KEY
+        return key
 
     def _moves_equal(self, m1: Move, m2: Move) -> bool:
         return m1.from_pos == m2.from_pos and m1.to_pos == m2.to_pos
@@ -141,8 +182,7 @@ class GameState:
         if king_pos is None:
             return True  # King missing; treat as check.
         enemy_color = Color.BLACK if color == Color.WHITE else Color.WHITE
-        enemy_moves = self.board.generate_pseudo_legal_moves(enemy_color)
-        return any(move.to_pos == king_pos for move in enemy_moves)
+        return self.board.is_square_attacked(king_pos, enemy_color)
 
     def algebraic_to_coords(self, notation: str) -> tuple[int, int]:
         col = ord(notation[0]) - ord('a')
@@ -154,10 +194,8 @@ class GameState:
             return False
 
         last_move = self.move_history.pop()
-        self.board.undo_move(last_move)
+        self.pop_move(last_move)
         self.redo_stack.append(last_move)  # 🔁 Save for redo
-
-        self.current_turn = Color.BLACK if self.current_turn == Color.WHITE else Color.WHITE
         return True
 
     def redo_last_move(self) -> bool:
@@ -165,10 +203,8 @@ class GameState:
             return False
 
         move = self.redo_stack.pop()
-        self.board.apply_move(move)
+        self.push_move(move)
         self.move_history.append(move)
-
-        self.current_turn = Color.BLACK if self.current_turn == Color.WHITE else Color.WHITE
         return True
 
     def print_move_history(self):
@@ -226,8 +262,9 @@ class GameState:
         self.move_history = []
         self.redo_stack = []
         self.halfmove_clock = 0
-        self.position_history = {}
         self.en_passant_target = None
+        self.state_stack = []
+        self.reset_hash_stack()
 
         moves = load_pgn(filename)
         print(f"PGN Moves: {moves}")
@@ -240,8 +277,22 @@ class GameState:
         print("✅ Game loaded and replayed.")
 
 def san_to_coords(san: str, game_state) -> Move | None:
+    san = san.rstrip('+#!?').replace('0', 'O')
     legal_moves = game_state.get_all_legal_moves()
     for move in legal_moves:
         if move_to_pgn(move) == san:
             return move
+
+    # Disambiguated SAN (e.g. Nbd7, R1e2, Qh4xe1)
+    match = re.fullmatch(r"([KQRBN])([a-h])?([1-8])?(x?[a-h][1-8])", san)
+    if match:
+        symbol, file, rank, target = match.groups()
+        for move in legal_moves:
+            if move_to_pgn(move) != symbol + target:
+                continue
+            if file and move.from_pos[1] != ord(file) - ord('a'):
+                continue
+            if rank and move.from_pos[0] != 8 - int(rank):
+                continue
+            return move
     return None
@@ -1,4 +1,6 @@
 class Move:
+    __slots__ = ('from_pos', 'to_pos', 'piece', 'captured', 'promotion', 'captured_pos', 'castling', 'prev_castling')
+
     def __init__(self, from_pos, to_pos, piece, captured=None, promotion=None, captured_pos=None, castling=False):
         self.from_pos = from_pos
         self.to_pos = to_pos
@@ -7,9 +9,14 @@ class Move:
         self.promotion = promotion
         self.captured_pos = captured_pos if captured_pos else to_pos
         self.castling = castling
+        self.prev_castling = 0  # board castling rights before the move, restored on undo
 
     def __repr__(self):
         fr = f"{chr(self.from_pos[1] + ord('a'))}{8 - self.from_pos[0]}"
         to = f"{chr(self.to_pos[1] + ord('a'))}{8 - self.to_pos[0]}"
         return f"{fr}{to}"
-    
\ No newline at end of file
+
+    def uci(self) -> str:
+        # Long algebraic with the promotion piece, e.g. "e7e8q"
+        promo = {"QUEEN": "q", "ROOK": "r", "BISHOP": "b", "KNIGHT": "n"}[self.promotion.name] if self.promotion else ""
+        return f"{self!r}{promo}"
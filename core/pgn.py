@@ -12,3 +12,36 @@ def load_pgn(filename: str) -> list[str]:
 
     tokens = content.strip().split()
     return [t for t in tokens if not t.endswith('.')]
+
+def parse_movetext(movetext: str) -> list[str]:
+    # Strip comments, variations and NAGs, then move numbers and results
+    movetext = re.sub(r"\{[^}]*\}|;[^\n]*", " ", movetext)
+    while re.search(r"\([^()]*\)", movetext):
+        movetext = re.sub(r"\([^()]*\)", " ", movetext)
+    movetext = re.sub(r"\$\d+", " ", movetext)
+    movetext = re.sub(r"\d+\.(\.\.)?", " ", movetext)
+
+    tokens = movetext.split()
+    return [t for t in tokens if t not in ("1-0", "0-1", "1/2-1/2", "*")]
+
+def load_pgn_games(filename: str) -> list[list[str]]:
+    # A PGN collection: every game starts with a header block, then movetext.
+    with open(filename, 'r', encoding='utf-8', errors='replace') as f:
+        content = f.read()
+
+    games = []
+    movetext = []
+    in_headers = False
+    for line in content.splitlines():
+        if line.startswith('['):
+            if not in_headers and movetext:
+                games.append(parse_movetext(' '.join(movetext)))
+                movetext = []
+            in_headers = True
+        else:
+            in_headers = False
+            movetext.append(line)
+    if any(line.strip() for line in movetext):
+        games.append(parse_movetext(' '.join(movetext)))
+
+    return [moves for moves in games if moves]
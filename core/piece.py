@@ -12,20 +12,57 @@ class PieceType(Enum):
     QUEEN = 'queen'
     KING = 'king'
 
+SYMBOLS = {
+    PieceType.PAWN: 'P',
+    PieceType.KNIGHT: 'N',
+    PieceType.BISHOP: 'B',
+    PieceType.ROOK: 'R',
+    PieceType.QUEEN: 'Q',
+    PieceType.KING: 'K',
+}
+
 class Piece:
-    def __init__(self, color: Color, piece_type: PieceType):
-        self.color = color
-        self.type = piece_type
-        self.has_moved = False
+    # Immutable: there is exactly one instance per (color, type) and Piece(color, type)
+    # returns it, so boards and moves share the 12 pieces of PIECES. Whether a king or
+    # rook has moved is the board's castling state, not the piece's.
+    __slots__ = ('color', 'type', 'index', '_symbol')
+    _instances = {}
+
+    def __new__(cls, color: Color, piece_type: PieceType):
+        return cls._instances[color, piece_type]
+
+    def __setattr__(self, name, value):
+        raise AttributeError("Pieces are shared and immutable")
+
+    def __reduce__(self):
+        return Piece, (self.color, self.type)  # pickles back to the shared instance
+
+    def __copy__(self):
+        return self
+
+    def __deepcopy__(self, memo):
+        return self
+
+    def __repr__(self):
+        return f"Piece({self.color.name}, {self.type.name})"
 
     def symbol(self) -> str:
-        symbols = {
-            PieceType.PAWN: 'P',
-            PieceType.KNIGHT: 'N',
-            PieceType.BISHOP: 'B',
-            PieceType.ROOK: 'R',
-            PieceType.QUEEN: 'Q',
-            PieceType.KING: 'K',
-        }
-        symbol = symbols[self.type]
-        return symbol if self.color == Color.WHITE else symbol.lower()
+        return self._symbol
+
+def _create(color: Color, piece_type: PieceType, index: int) -> Piece:
+    piece = object.__new__(Piece)
+    symbol = SYMBOLS[piece_type]
+    for name, value in (
+        ('color', color), ('type', piece_type), ('index', index),
+        ('_symbol', symbol if color == Color.WHITE else symbol.lower()),
+    ):
+        object.__setattr__(piece, name, value)
+    Piece._instances[color, piece_type] = piece
+    return piece
+
+# Indexed by core.zobrist.piece_index: white pawn, black pawn, white knight, black knight, ...
+PIECES = [
+    _create(color, piece_type, i * 2 + j)
+    for i, piece_type in enumerate(PieceType)
+    for j, color in enumerate((Color.WHITE, Color.BLACK))
+]
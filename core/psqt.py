@@ -0,0 +1,210 @@
+from core.piece import PieceType, Color
+from core.zobrist import PIECE_ORDER
+
+# Material, piece-square and game-phase values. They live in core because the board
+# keeps their sums up to date incrementally; engine.evaluation builds its score on them.
+
+# --- Base Piece Values ---
+PIECE_VALUES = {
+    PieceType.PAWN: 100,
+    PieceType.KNIGHT: 320,
+    PieceType.BISHOP: 330,
+    PieceType.ROOK: 500,
+    PieceType.QUEEN: 900,
+    PieceType.KING: 0  # King isn't scored directly
+}
+
+# Endgame material: pawns gain value as they approach promotion, minors lose a little
+EG_PIECE_VALUES = {
+    PieceType.PAWN: 120,
+    PieceType.KNIGHT: 300,
+    PieceType.BISHOP: 320,
+    PieceType.ROOK: 520,
+    PieceType.QUEEN: 920,
+    PieceType.KING: 0
+}
+
+# --- Piece-Square Tables ---
+# Indexed [rank][col] from the owner's side: row 0 is the owner's back rank.
+PAWN_TABLE = [
+    [0, 0, 0, 0, 0, 0, 0, 0],
+    [5, 10, 10, -20, -20, 10, 10, 5],
+    [5, -5, -10, 0, 0, -10, -5, 5],
+    [0, 0, 0, 20, 20, 0, 0, 0],
+    [5, 5, 10, 25, 25, 10, 5, 5],
+    [10, 10, 20, 30, 30, 20, 10, 10],
+    [50, 50, 50, 50, 50, 50, 50, 50],
+    [0, 0, 0, 0, 0, 0, 0, 0]
+]
+
+PAWN_ENDGAME_TABLE = [
+    [0, 0, 0, 0, 0, 0, 0, 0],
+    [0, 0, 0, 0, 0, 0, 0, 0],
+    [5, 5, 5, 5, 5, 5, 5, 5],
+    [15, 15, 15, 15, 15, 15, 15, 15],
+    [30, 30, 30, 30, 30, 30, 30, 30],
+    [50, 50, 50, 50, 50, 50, 50, 50],
+    [80, 80, 80, 80, 80, 80, 80, 80],
+    [0, 0, 0, 0, 0, 0, 0, 0]
+]
+
+KNIGHT_TABLE = [
+    [-50, -40, -30, -30, -30, -30, -40, -50],
+    [-40, -20, 0, 5, 5, 0, -20, -40],
+    [-30, 5, 10, 15, 15, 10, 5, -30],
+    [-30, 0, 15, 20, 20, 15, 0, -30],
+    [-30, 5, 15, 20, 20, 15, 5, -30],
+    [-30, 0, 10, 15, 15, 10, 0, -30],
+    [-40, -20, 0, 0, 0, 0, -20, -40],
+    [-50, -40, -30, -30, -30, -30, -40, -50]
+]
+
+BISHOP_TABLE = [
+    [-20, -10, -10, -10, -10, -10, -10, -20],
+    [-10, 5, 0, 0, 0, 0, 5, -10],
+    [-10, 10, 10, 10, 10, 10, 10, -10],
+    [-10, 0, 10, 10, 10, 10, 0, -10],
+    [-10, 5, 5, 10, 10, 5, 5, -10],
+    [-10, 0, 5, 10, 10, 5, 0, -10],
+    [-10, 0, 0, 0, 0, 0, 0, -10],
+    [-20, -10, -10, -10, -10, -10, -10, -20]
+]
+
+ROOK_TABLE = [
+    [0, 0, 0, 5, 5, 0, 0, 0],
+    [-5, 0, 0, 0, 0, 0, 0, -5],
+    [-5, 0, 0, 0, 0, 0, 0, -5],
+    [-5, 0, 0, 0, 0, 0, 0, -5],
+    [-5, 0, 0, 0, 0, 0, 0, -5],
+    [-5, 0, 0, 0, 0, 0, 0, -5],
+    [5, 10, 10, 10, 10, 10, 10, 5],
+    [0, 0, 0, 0, 0, 0, 0, 0]
+]
+
+QUEEN_TABLE = [
+    [-20, -10, -10, -5, -5, -10, -10, -20],
+    [-10, 0, 5, 0, 0, 0, 0, -10],
+    [-10, 5, 5, 5, 5, 5, 0, -10],
+    [0, 0, 5, 5, 5, 5, 0, -5],
+    [-5, 0, 5, 5, 5, 5, 0, -5],
+    [-10, 0, 5, 5, 5, 5, 0, -10],
+    [-10, 0, 0, 0, 0, 0, 0, -10],
+    [-20, -10, -10, -5, -5, -10, -10, -20]
+]
+
+KING_TABLE = [
+    [20, 30, 10, 0, 0, 10, 30, 20],
+    [20, 20, 0, 0, 0, 0, 20, 20],
+    [-10, -20, -20, -20, -20, -20, -20, -10],
+    [-20, -30, -30, -40, -40, -30, -30, -20],
+    [-30, -40, -40, -50, -50, -40, -40, -30],
+    [-30, -40, -40, -50, -50, -40, -40, -30],
+    [-30, -40, -40, -50, -50, -40, -40, -30],
+    [-30, -40, -40, -50, -50, -40, -40, -30]
+]
+
+# Endgame: minor and major pieces mostly want the centre, with smaller bonuses than
+# in the midgame; development and back-rank safety no longer matter.
+KNIGHT_ENDGAME_TABLE = [
+    [-50, -40, -30, -25, -25, -30, -40, -50],
+    [-40, -20, -5, 0, 0, -5, -20, -40],
+    [-30, -5, 10, 15, 15, 10, -5, -30],
+    [-25, 0, 15, 20, 20, 15, 0, -25],
+    [-25, 0, 15, 20, 20, 15, 0, -25],
+    [-30, -5, 10, 15, 15, 10, -5, -30],
+    [-40, -20, -5, 0, 0, -5, -20, -40],
+    [-50, -40, -30, -25, -25, -30, -40, -50]
+]
+
+BISHOP_ENDGAME_TABLE = [
+    [-15, -10, -10, -10, -10, -10, -10, -15],
+    [-10, 0, 0, 0, 0, 0, 0, -10],
+    [-10, 0, 5, 5, 5, 5, 0, -10],
+    [-10, 0, 5, 10, 10, 5, 0, -10],
+    [-10, 0, 5, 10, 10, 5, 0, -10],
+    [-10, 0, 5, 5, 5, 5, 0, -10],
+    [-10, 0, 0, 0, 0, 0, 0, -10],
+    [-15, -10, -10, -10, -10, -10, -10, -15]
+]
+
+ROOK_ENDGAME_TABLE = [
+    [0, 0, 0, 0, 0, 0, 0, 0],
+    [0, 0, 0, 0, 0, 0, 0, 0],
+    [0, 0, 0, 0, 0, 0, 0, 0],
+    [0, 0, 0, 0, 0, 0, 0, 0],
+    [5, 5, 5, 5, 5, 5, 5, 5],
+    [5, 5, 5, 5, 5, 5, 5, 5],
+    [15, 15, 15, 15, 15, 15, 15, 15],
+    [5, 5, 5, 5, 5, 5, 5, 5]
+]
+
+QUEEN_ENDGAME_TABLE = [
+    [-20, -15, -10, -10, -10, -10, -15, -20],
+    [-15, -5, 0, 0, 0, 0, -5, -15],
+    [-10, 0, 10, 10, 10, 10, 0, -10],
+    [-10, 0, 10, 20, 20, 10, 0, -10],
+    [-10, 0, 10, 20, 20, 10, 0, -10],
+    [-10, 0, 10, 10, 10, 10, 0, -10],
+    [-15, -5, 0, 0, 0, 0, -5, -15],
+    [-20, -15, -10, -10, -10, -10, -15, -20]
+]
+
+KING_ENDGAME_TABLE = [
+    [-50, -30, -30, -30, -30, -30, -30, -50],
+    [-30, -30, 0, 0, 0, 0, -30, -30],
+    [-30, -10, 20, 30, 30, 20, -10, -30],
+    [-30, -10, 30, 40, 40, 30, -10, -30],
+    [-30, -10, 30, 40, 40, 30, -10, -30],
+    [-30, -10, 20, 30, 30, 20, -10, -30],
+    [-30, -20, -10, 0, 0, -10, -20, -30],
+    [-50, -40, -30, -20, -20, -30, -40, -50]
+]
+
+PIECE_SQUARE_TABLES = {
+    PieceType.PAWN: PAWN_TABLE,
+    PieceType.KNIGHT: KNIGHT_TABLE,
+    PieceType.BISHOP: BISHOP_TABLE,
+    PieceType.ROOK: ROOK_TABLE,
+    PieceType.QUEEN: QUEEN_TABLE,
+    PieceType.KING: KING_TABLE
+}
+
+ENDGAME_PIECE_SQUARE_TABLES = {
+    PieceType.PAWN: PAWN_ENDGAME_TABLE,
+    PieceType.KNIGHT: KNIGHT_ENDGAME_TABLE,
+    PieceType.BISHOP: BISHOP_ENDGAME_TABLE,
+    PieceType.ROOK: ROOK_ENDGAME_TABLE,
+    PieceType.QUEEN: QUEEN_ENDGAME_TABLE,
+    PieceType.KING: KING_ENDGAME_TABLE
+}
+
+# --- Game Phase ---
+# 24 with all minor and major pieces on the board, 0 in a pure pawn endgame
+PHASE_WEIGHTS = {
+    PieceType.PAWN: 0,
+    PieceType.KNIGHT: 1,
+    PieceType.BISHOP: 1,
+    PieceType.ROOK: 2,
+    PieceType.QUEEN: 4,
+    PieceType.KING: 0
+}
+MAX_PHASE = 24
+
+# --- Precomputed Lookups ---
+# Flat tables indexed [piece_index * 64 + row * 8 + col] (see core.zobrist.piece_index),
+# folding material and piece-square bonus into one signed value (White positive).
+def _flat_table(values, tables):
+    flat = [0] * (12 * 64)
+    for piece_type in PIECE_ORDER:
+        table = tables[piece_type]
+        for color, sign in ((Color.WHITE, 1), (Color.BLACK, -1)):
+            index = PIECE_ORDER.index(piece_type) * 2 + (0 if color == Color.WHITE else 1)
+            for row in range(8):
+                pst_row = row if color == Color.BLACK else 7 - row
+                for col in range(8):
+                    flat[index * 64 + row * 8 + col] = sign * (values[piece_type] + table[pst_row][col])
+    return flat
+
+MG_TABLE = _flat_table(PIECE_VALUES, PIECE_SQUARE_TABLES)
+EG_TABLE = _flat_table(EG_PIECE_VALUES, ENDGAME_PIECE_SQUARE_TABLES)
+PHASE_TABLE = [PHASE_WEIGHTS[piece_type] for piece_type in PIECE_ORDER for _ in (Color.WHITE, Color.BLACK)]
@@ -0,0 +1,37 @@
+import random
+from core.piece import Color, PieceType
+
+# Fixed seed: opening books and tablebases store these keys on disk,
+# so they must be identical from run to run.
+_rng = random.Random(0x5EED_C4E5)
+
+PIECE_ORDER = [
+    PieceType.PAWN, PieceType.KNIGHT, PieceType.BISHOP,
+    PieceType.ROOK, PieceType.QUEEN, PieceType.KING
+]
+
+PIECE_KEYS = [[_rng.getrandbits(64) for _ in range(64)] for _ in range(12)]
+CASTLING_KEYS = [_rng.getrandbits(64) for _ in range(16)]
+EN_PASSANT_KEYS = [_rng.getrandbits(64) for _ in range(8)]
+SIDE_KEY = _rng.getrandbits(64)
+
+
+def piece_index(piece) -> int:
+    # 0..11: white pawn, black pawn, white knight, black knight, ... (core.piece.PIECES order)
+    return piece.index
+
+
+def compute_hash(board, turn: Color, en_passant_target=None) -> int:
+    key = 0
+    for row in range(8):
+        for col in range(8):
+            piece = board.grid[row][col]
+            if piece:
+                key ^= PIECE_KEYS[piece_index(piece)][row * 8 + col]
+
+    key ^= CASTLING_KEYS[board.castling_rights()]
+    if en_passant_target:
+        key ^= EN_PASSANT_KEYS[en_passant_target[1]]
+    if turn == Color.BLACK:
+        key ^= SIDE_KEY
+    return key
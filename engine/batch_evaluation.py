@@ -0,0 +1,153 @@
+from __future__ import annotations
+
+try:
+    import numpy as np
+except ImportError:  # optional: evaluate_positions / evaluate_children then score one position at a time
+    np = None
+
+from core.piece import Color
+from core.zobrist import PIECE_ORDER
+from engine import evaluation
+
+# --- Encoding ---
+# One int8 per square (row * 8 + col): 0 empty, +1..+6 white, -1..-6 black,
+# in PIECE_ORDER (pawn, knight, bishop, rook, queen, king).
+PAWN, KING = 1, 6
+# Board.to_mailbox() byte (0 empty, else core.piece.PIECES index + 1) -> signed code
+_MAILBOX_CODES = [0] + [(i // 2 + 1) * (-1 if i % 2 else 1) for i in range(len(PIECE_ORDER) * 2)]
+
+def _require_numpy():
+    if np is None:
+        raise ImportError("Vectorized batch evaluation needs numpy (pip install numpy)")
+
+def encode_board(board) -> np.ndarray:
+    return _MAILBOX_ARRAY[np.frombuffer(board.to_mailbox(), dtype=np.uint8)]
+
+def encode_positions(game_states) -> tuple[np.ndarray, np.ndarray]:
+    # -> ((N, 64) int8 codes, (N,) bool white to move)
+    _require_numpy()
+    codes = np.stack([encode_board(gs.board) for gs in game_states]) if game_states else np.zeros((0, 64), np.int8)
+    white_to_move = np.array([gs.current_turn == Color.WHITE for gs in game_states], dtype=bool)
+    return codes, white_to_move
+
+# --- Precomputed Tables ---
+# Rows indexed by code + 6, built from the flat per-(piece, color, square) tables in engine.evaluation
+def _by_code(flat, width):
+    table = np.zeros((13, width), dtype=np.int32)
+    for code in range(1, 7):
+        white_index = (code - 1) * 2
+        table[code + 6] = flat[white_index * width:(white_index + 1) * width]
+        table[-code + 6] = flat[(white_index + 1) * width:(white_index + 2) * width]
+    return table
+
+if np is not None:
+    _MAILBOX_ARRAY = np.array(_MAILBOX_CODES, dtype=np.int8)
+    MG_SCORES = _by_code(evaluation.MG_TABLE, 64)
+    EG_SCORES = _by_code(evaluation.EG_TABLE, 64)
+    PHASE_BY_CODE = _by_code(evaluation.PHASE_TABLE, 1)[:, 0]
+    _SQUARES = np.arange(64)
+
+# --- Pawn Structure ---
+def _pawn_structure(own: np.ndarray, enemy: np.ndarray, white: bool) -> np.ndarray:
+    # own / enemy: (N, 8, 8) bool pawn masks; returns bonus for the side owning `own`
+    files = own.sum(axis=1)                                   # (N, 8) pawns per file
+    doubled = np.where(files > 1, files, 0).sum(axis=1)
+
+    has_pawn = files > 0
+    left = np.pad(has_pawn, ((0, 0), (1, 0)))[:, :-1]
+    right = np.pad(has_pawn, ((0, 0), (0, 1)))[:, 1:]
+    isolated = np.where(~left & ~right, files, 0).sum(axis=1)
+
+    # A pawn is passed when no enemy pawn stands ahead of it on its own or an adjacent file.
+    rows = np.arange(8).reshape(1, 8, 1)
+    if white:
+        # White moves towards row 0: "ahead" is the smallest enemy row
+        nearest = np.where(enemy, rows, 8).min(axis=1)        # (N, 8)
+        fill = 8
+    else:
+        nearest = np.where(enemy, rows, -1).max(axis=1)
+        fill = -1
+    padded = np.pad(nearest, ((0, 0), (1, 1)), constant_values=fill)
+    stack = np.stack([padded[:, :-2], padded[:, 1:-1], padded[:, 2:]])
+    blocker = stack.min(axis=0) if white else stack.max(axis=0)  # (N, 8) per file
+    blocker = blocker[:, None, :]
+    clear = blocker >= rows if white else blocker <= rows
+    passed = (own & clear).sum(axis=(1, 2))
+
+    return (
+        passed * evaluation.PASSED_PAWN_BONUS
+        - doubled * evaluation.DOUBLED_PAWN_PENALTY
+        - isolated * evaluation.ISOLATED_PAWN_PENALTY
+    )
+
+# --- King Safety ---
+def _king_shield(codes: np.ndarray, king_code: int, pawn_code: int, forward: int) -> np.ndarray:
+    has_king = (codes == king_code).any(axis=1)
+    king_sq = np.argmax(codes == king_code, axis=1)
+    row, col = np.divmod(king_sq, 8)
+    shield_row = row + forward
+
+    penalty = np.zeros(len(codes), dtype=np.int32)
+    row_ok = has_king & (shield_row >= 0) & (shield_row < 8)
+    for dc in (-1, 0, 1):
+        c = col + dc
+        valid = row_ok & (c >= 0) & (c < 8)
+        sq = np.clip(shield_row * 8 + c, 0, 63)
+        pawn_there = codes[np.arange(len(codes)), sq] == pawn_code
+        penalty += np.where(valid & ~pawn_there, evaluation.KING_SHIELD_PENALTY, 0)
+    return penalty
+
+# --- Batch Evaluation ---
+def evaluate_static_batch(codes: np.ndarray) -> np.ndarray:
+    # Vectorized evaluation.static_score: (N, 64) codes -> (N,) scores, White's point of view.
+    # Mobility needs legal move generation and is not included.
+    _require_numpy()
+    codes = np.asarray(codes, dtype=np.int8)
+    rows = codes.astype(np.intp) + 6
+    mg = MG_SCORES[rows, _SQUARES].sum(axis=1)
+    eg = EG_SCORES[rows, _SQUARES].sum(axis=1)
+    phase = np.minimum(PHASE_BY_CODE[rows].sum(axis=1), evaluation.MAX_PHASE)
+    scores = (mg * phase + eg * (evaluation.MAX_PHASE - phase)) // evaluation.MAX_PHASE
+
+    grid = codes.reshape(-1, 8, 8)
+    white_pawns = grid == PAWN
+    black_pawns = grid == -PAWN
+    scores += _pawn_structure(white_pawns, black_pawns, white=True)
+    scores -= _pawn_structure(black_pawns, white_pawns, white=False)
+
+    scores -= _king_shield(codes, KING, PAWN, forward=-1)
+    scores += _king_shield(codes, -KING, -PAWN, forward=1)
+    return scores
+
+def evaluate_batch(codes: np.ndarray, white_to_move: np.ndarray) -> np.ndarray:
+    # Side-to-move relative, like evaluate_board
+    scores = evaluate_static_batch(codes)
+    return np.where(white_to_move, scores, -scores)
+
+def evaluate_positions(game_states) -> np.ndarray:
+    if np is None:
+        return [_static(gs, gs.current_turn) for gs in game_states]
+    codes, white_to_move = encode_positions(game_states)
+    return evaluate_batch(codes, white_to_move)
+
+def evaluate_children(game_state, moves) -> np.ndarray:
+    # Static score of each child, from the point of view of the side to move before the move
+    if np is None:
+        scores = []
+        for move in moves:
+            game_state.push_move(move)
+            scores.append(-_static(game_state, game_state.current_turn))
+            game_state.pop_move(move)
+        return scores
+    codes = np.zeros((len(moves), 64), dtype=np.int8)
+    for i, move in enumerate(moves):
+        game_state.push_move(move)
+        codes[i] = encode_board(game_state.board)
+        game_state.pop_move(move)
+    scores = evaluate_static_batch(codes)
+    return scores if game_state.current_turn == Color.WHITE else -scores
+
+def _static(game_state, color) -> int:
+    # Fallback without numpy: evaluation.static_score from `color`'s point of view
+    score = evaluation.static_score(game_state.board)
+    return score if color == Color.WHITE else -score
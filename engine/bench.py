@@ -0,0 +1,145 @@
+import json
+import sys
+import time
+
+from core.fen import game_from_fen
+from engine.bot import iterative_deepening
+
+# --- Positions ---
+# Openings, middlegames, tactics and endgames. Changing this list changes the node
+# signature, so results are only comparable between runs with the same positions.
+BENCH_POSITIONS = [
+    # Openings
+    "rnbqkbnr/pppppppp/8/8/8/8/PPPPPPPP/RNBQKBNR w KQkq - 0 1",
+    "rnbqkbnr/pppppppp/8/8/4P3/8/PPPP1PPP/RNBQKBNR b KQkq e3 0 1",
+    "rnbqkbnr/pp1ppppp/8/2p5/4P3/5N2/PPPP1PPP/RNBQKB1R b KQkq - 1 2",
+    "r1bqkbnr/pppp1ppp/2n5/1B2p3/4P3/5N2/PPPP1PPP/RNBQK2R b KQkq - 3 3",
+    "rnbqkb1r/pppp1ppp/4pn2/8/2PP4/8/PP2PPPP/RNBQKBNR w KQkq - 0 3",
+    "rnbqkbnr/ppp1pppp/8/3p4/2PP4/8/PP2PPPP/RNBQKBNR b KQkq c3 0 2",
+    "rnbqkb1r/pp2pppp/3p1n2/8/3NP3/8/PPP2PPP/RNBQKB1R w KQkq - 1 5",
+    "r1bqkb1r/pppp1ppp/2n2n2/4p3/2B1P3/5N2/PPPP1PPP/RNBQK2R w KQkq - 4 4",
+    "rnbqk2r/ppp1ppbp/3p1np1/8/2PPP3/2N5/PP3PPP/R1BQKBNR w KQkq - 0 5",
+    "rnbqkbnr/pp2pppp/2p5/3p4/3PP3/8/PPP2PPP/RNBQKBNR w KQkq - 0 3",
+    # Middlegames
+    "r3k2r/p1ppqpb1/bn2pnp1/3PN3/1p2P3/2N2Q1p/PPPBBPPP/R3K2R w KQkq - 0 1",
+    "r4rk1/1pp1qppp/p1np1n2/2b1p1B1/2B1P1b1/P1NP1N2/1PP1QPPP/R4RK1 w - - 0 10",
+    "r1bq1rk1/pp2bppp/2n1pn2/3p4/2PP4/2N1PN2/PP1B1PPP/R2QKB1R w KQ - 0 8",
+    "2rq1rk1/pp1bppbp/2np1np1/8/3NP3/1BN1BP2/PPPQ2PP/2KR3R b - - 2 11",
+    "r1bqr1k1/ppp2ppp/2np1n2/2b1p3/2B1P3/2PP1N2/PP1N1PPP/R1BQR1K1 w - - 1 8",
+    "r2q1rk1/pb1nbppp/1p2pn2/2pp4/3P4/1P1BPN2/PBPN1PPP/R2Q1RK1 w - - 2 10",
+    "3r1rk1/pp2qppp/2n1bn2/2bpp3/8/1PNPPNP1/PBQ2PBP/R4RK1 w - - 0 13",
+    "r1b2rk1/2q1bppp/p2ppn2/1p6/3QP3/1BN1B3/PPP3PP/R4RK1 w - - 0 13",
+    "r2qkb1r/pp2nppp/3p4/2pNN1B1/2BnP3/3P4/PPP2PPP/R2bK2R w KQkq - 1 10",
+    "rnb2k1r/pp1Pbppp/2p5/q7/2B5/8/PPPQNnPP/RNB1K2R w KQ - 3 9",
+    # Tactics
+    "6k1/5ppp/8/8/8/8/5PPP/R5K1 w - - 0 1",
+    "r1bqkb1r/pppp1ppp/2n2n2/4p2Q/2B1P3/8/PPPP1PPP/RNB1K1NR w KQkq - 4 4",
+    "r1b1k2r/ppppnppp/2n2q2/2b5/3NP3/2P1B3/PP3PPP/RN1QKB1R w KQkq - 0 7",
+    "2kr3r/ppp2ppp/2n5/2b1q3/4P1b1/2NB1N2/PPP2PPP/R2QR1K1 b - - 0 12",
+    "r5k1/5ppp/8/8/8/8/5PPP/6K1 b - - 0 1",
+    "4r1k1/pp3ppp/8/3q4/8/1P3Q2/P4PPP/3R2K1 w - - 0 1",
+    "r1bqk2r/pppp1Bpp/2n2n2/2b1p3/4P3/5N2/PPPP1PPP/RNBQK2R b KQkq - 0 4",
+    "3qr2k/pbpp2pp/1p5N/3Q2b1/2P1P3/P7/1PP2PPP/R4RK1 w - - 0 1",
+    # Endgames
+    "8/2p5/3p4/KP5r/1R3p1k/8/4P1P1/8 w - - 0 1",
+    "8/8/8/4k3/8/8/4P3/4K3 w - - 0 1",
+    "8/8/4k3/8/2K5/8/3P4/8 w - - 0 1",
+    "6k1/5p2/6p1/8/7p/8/6PP/6K1 b - - 0 1",
+    "8/5pk1/6p1/7p/7P/6P1/5PK1/8 w - - 0 1",
+    "8/8/1p1k4/1P6/2K5/8/8/8 w - - 0 1",
+    "4k3/8/8/8/8/8/8/R3K3 w Q - 0 1",
+    "8/8/8/8/5k2/8/3Q4/K7 w - - 0 1",
+    "2r3k1/5ppp/8/8/8/8/5PPP/3R2K1 w - - 0 1",
+    "8/6pk/8/3R4/8/8/r5PK/8 w - - 0 1",
+    "8/3k4/8/2b5/8/5N2/3K4/8 w - - 0 1",
+    "8/p7/1p6/2p2k2/2P5/1P3K2/P7/8 w - - 0 1",
+]
+
+DEFAULT_DEPTH = 2
+NPS_TOLERANCE = 0.10  # slower than this fraction of the baseline NPS counts as a regression
+
+# --- Running ---
+def run_bench(depth=DEFAULT_DEPTH, positions=None, verbose=True) -> dict:
+    positions = positions or BENCH_POSITIONS
+    results = []
+    start = time.perf_counter()
+    for i, fen in enumerate(positions, 1):
+        stats = iterative_deepening(game_from_fen(fen), max_depth=depth, verbose=False)
+        results.append({
+            "fen": fen,
+            "move": repr(stats.best_move) if stats.best_move else None,
+            "score": stats.score,
+            "nodes": stats.total_nodes,
+            "seconds": round(stats.elapsed, 4),
+            "time_to_depth": [round(it["seconds"], 4) for it in stats.iterations],
+        })
+        if verbose:
+            print(f"{i:>3}/{len(positions)} {results[-1]['move']:<6} {stats.total_nodes:>8} nodes {stats.elapsed:>7.2f}s  {fen}")
+
+    elapsed = time.perf_counter() - start
+    nodes = sum(r["nodes"] for r in results)
+    return {
+        "depth": depth,
+        "positions": len(positions),
+        "nodes": nodes,  # deterministic signature of the search at this depth
+        "seconds": round(elapsed, 3),
+        "nps": int(nodes / elapsed) if elapsed > 0 else 0,
+        "results": results,
+    }
+
+def save_bench(report: dict, path: str):
+    with open(path, 'w') as f:
+        json.dump(report, f, indent=2)
+
+def load_bench(path: str) -> dict:
+    with open(path) as f:
+        return json.load(f)
+
+# --- Regression Check ---
+def compare_bench(baseline: dict, current: dict, tolerance=NPS_TOLERANCE) -> list[str]:
+    # Returns a list of problems; empty means no regression
+    if baseline["depth"] != current["depth"] or baseline["positions"] != current["positions"]:
+        return [f"runs are not comparable (depth {baseline['depth']} vs {current['depth']}, "
+                f"{baseline['positions']} vs {current['positions']} positions)"]
+
+    problems = []
+    if baseline["nodes"] != current["nodes"]:
+        # Not necessarily bad, but the search changed: the new file becomes the baseline
+        problems.append(f"node signature changed: {baseline['nodes']} -> {current['nodes']}")
+        for old, new in zip(baseline["results"], current["results"]):
+            if old["move"] != new["move"]:
+                problems.append(f"  best move {old['move']} -> {new['move']} in {new['fen']}")
+    if current["nps"] < baseline["nps"] * (1 - tolerance):
+        problems.append(f"NPS dropped: {baseline['nps']} -> {current['nps']} "
+                        f"({current['nps'] / baseline['nps'] - 1:+.0%})")
+    return problems
+
+if __name__ == "__main__":
+    # python -m engine.bench [depth] [--save results.json] [--compare baseline.json]
+    args = sys.argv[1:]
+    depth = DEFAULT_DEPTH
+    save_path = compare_path = None
+    while args:
+        arg = args.pop(0)
+        if arg == "--save" and args:
+            save_path = args.pop(0)
+        elif arg == "--compare" and args:
+            compare_path = args.pop(0)
+        elif arg.isdigit():
+            depth = int(arg)
+        else:
+            print("Usage: python -m engine.bench [depth] [--save results.json] [--compare baseline.json]")
+            sys.exit(1)
+
+    report = run_bench(depth)
+    print(f"Nodes: {report['nodes']}  Time: {report['seconds']:.2f}s  NPS: {report['nps']}")
+    if save_path:
+        save_bench(report, save_path)
+        print(f"✅ Saved results to {save_path}")
+    if compare_path:
+        problems = compare_bench(load_bench(compare_path), report)
+        for problem in problems:
+            print(f"⚠️ {problem}")
+        if problems:
+            sys.exit(1)
+        print("✅ No regression against", compare_path)
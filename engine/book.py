@@ -0,0 +1,121 @@
+import mmap
+import os
+import random
+import struct
+import sys
+from collections import defaultdict
+
+from core.board import Board
+from core.game_state import GameState, san_to_coords
+from core.pgn import load_pgn_games
+from core.piece import PieceType
+
+# --- Book File Format ---
+# Fixed-size records sorted by Zobrist key: (key: u64, move: u16, weight: u16).
+# Moves are encoded as from_square | to_square << 6 | promotion << 12, with
+# squares numbered row * 8 + col in Board.grid coordinates.
+RECORD = struct.Struct(">QHH")
+RECORD_SIZE = RECORD.size
+MAX_WEIGHT = 0xFFFF
+
+PROMOTION_CODES = {
+    None: 0,
+    PieceType.KNIGHT: 1,
+    PieceType.BISHOP: 2,
+    PieceType.ROOK: 3,
+    PieceType.QUEEN: 4,
+}
+
+def encode_move(move) -> int:
+    fr = move.from_pos[0] * 8 + move.from_pos[1]
+    to = move.to_pos[0] * 8 + move.to_pos[1]
+    return fr | (to << 6) | (PROMOTION_CODES[move.promotion] << 12)
+
+# --- Builder ---
+def build_book(pgn_files: list[str], output: str, max_ply: int = 30, min_count: int = 1) -> int:
+    counts = defaultdict(int)
+
+    for filename in pgn_files:
+        for moves in load_pgn_games(filename):
+            game = GameState(Board())
+            for san in moves[:max_ply]:
+                move = san_to_coords(san, game)
+                if move is None:
+                    break  # Unparseable or illegal: keep what we have so far
+                counts[(game.zobrist_key(), encode_move(move))] += 1
+                game.make_move(move, silent=True)
+
+    records = sorted(
+        (key, code, min(count, MAX_WEIGHT))
+        for (key, code), count in counts.items()
+        if count >= min_count
+    )
+    with open(output, 'wb') as f:
+        for record in records:
+            f.write(RECORD.pack(*record))
+
+    return len(records)
+
+# --- Runtime ---
+class OpeningBook:
+    def __init__(self, path: str):
+        self._file = open(path, 'rb')
+        size = os.fstat(self._file.fileno()).st_size
+        # mmap refuses empty files; an empty book simply never hits
+        self._data = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ) if size else b""
+        self.entries = size // RECORD_SIZE
+
+    def close(self):
+        if isinstance(self._data, mmap.mmap):
+            self._data.close()
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def _key_at(self, index: int) -> int:
+        return RECORD.unpack_from(self._data, index * RECORD_SIZE)[0]
+
+    def lookup(self, key: int) -> list[tuple[int, int]]:
+        # Binary search for the first record with this key
+        lo, hi = 0, self.entries
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if self._key_at(mid) < key:
+                lo = mid + 1
+            else:
+                hi = mid
+
+        results = []
+        while lo < self.entries:
+            record_key, code, weight = RECORD.unpack_from(self._data, lo * RECORD_SIZE)
+            if record_key != key:
+                break
+            results.append((code, weight))
+            lo += 1
+        return results
+
+    def choose_move(self, game_state, rng=random):
+        candidates = [(code, weight) for code, weight in self.lookup(game_state.zobrist_key()) if weight > 0]
+        if not candidates:
+            return None
+
+        legal_by_code = {encode_move(move): move for move in game_state.get_all_legal_moves()}
+        candidates = [(code, weight) for code, weight in candidates if code in legal_by_code]
+        if not candidates:
+            return None  # Hash collision or stale book
+
+        codes = [code for code, _ in candidates]
+        weights = [weight for _, weight in candidates]
+        return legal_by_code[rng.choices(codes, weights=weights)[0]]
+
+if __name__ == "__main__":
+    # python -m engine.book build book.bin games1.pgn [games2.pgn ...]
+    if len(sys.argv) < 4 or sys.argv[1] != "build":
+        print("Usage: python -m engine.book build <output.bin> <games.pgn> [...]")
+        sys.exit(1)
+    count = build_book(sys.argv[3:], sys.argv[2])
+    print(f"✅ Wrote {count} book entries to {sys.argv[2]}")
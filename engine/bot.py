@@ -1,32 +1,162 @@
+import copy
+import threading
 import time
-from engine.search import minimax
+from engine.search import (
+    SearchAborted, SearchContext, SearchStats, TranspositionTable, move_key, search_lines,
+)
+from engine.evaluation import EvalCache
 from core.piece import Color
 
-def choose_best_move_iterative(game_state, time_limit=1.0):
-    start_time = time.time()
-    best_move = None
-    depth = 1
+MAX_DEPTH = 64  # iteration cap for searches without a depth or time limit (pondering)
+
+def iterative_deepening(game_state, time_limit=1.0, max_depth=None, book=None, tablebases=None,
+                        profile=False, verbose=True, context=None, multipv=1) -> SearchStats:
+    # Runs the search and returns its statistics; stats.best_move is the move to play.
+    # max_depth searches exactly that deep; otherwise the search stops after time_limit
+    # seconds (None: until context.stopped is set). Pass a context to share its
+    # transposition table or to stop / extend the search from another thread.
+    # multipv > 1 ranks that many root moves in stats.lines (analysis; skips book and tablebase moves).
+    context = context or SearchContext(tablebases=tablebases, tt=TranspositionTable(), eval_cache=EvalCache())
+    stats = context.stats
+    if multipv > 1:
+        book = tablebases = None
+
+    if book:
+        book_move = book.choose_move(game_state)
+        if book_move:
+            if verbose:
+                print(f"📖 Book move: {book_move}")
+            stats.source, stats.best_move = "book", book_move
+            return stats
+
+    if tablebases:
+        tb_move = tablebases.best_move(game_state)
+        if tb_move:
+            if verbose:
+                print(f"📚 Tablebase move: {tb_move}")
+            stats.source, stats.best_move = "tablebase", tb_move
+            return stats
+
+    profiler = None
+    if profile:
+        from engine.profiling import HotFunctionProfiler
+        profiler = HotFunctionProfiler().__enter__()
 
     maximizing = game_state.current_turn == Color.WHITE
+    start_time = time.perf_counter()
+    if max_depth is None and time_limit is not None and context.deadline is None:
+        context.deadline = start_time + time_limit
+    if context.tt is not None:
+        context.tt.new_search()
+    depth = 1
+
+    try:
+        while depth <= (max_depth or MAX_DEPTH):
+            if context.deadline is not None and time.perf_counter() >= context.deadline:
+                break
+
+            iteration_start = time.perf_counter()
+            try:
+                lines = search_lines(game_state, depth, maximizing, context, multipv)
+            except SearchAborted:
+                break  # keep the last completed iteration
+            if not lines:
+                break  # no legal moves
+            stats.lines = lines
+            score, move, pv = lines[0]
+            stats.record_iteration(depth, score, move, pv, time.perf_counter() - iteration_start)
+
+            depth += 1  # Try searching one level deeper
+    finally:
+        stats.elapsed = time.perf_counter() - start_time
+        if profiler:
+            profiler.__exit__(None, None, None)
+            stats.profile = profiler.report()
+
+    if verbose:
+        print(f"⏱ {stats.summary()}")
+    return stats
+
+def choose_best_move_iterative(game_state, time_limit=1.0, book=None, tablebases=None, max_depth=None):
+    # max_depth searches to exactly that depth regardless of time_limit
+    return iterative_deepening(game_state, time_limit, max_depth, book, tablebases).best_move
+
+def analyse(game_state, multipv=3, time_limit=1.0, max_depth=None, tablebases=None, verbose=False) -> list:
+    # Ranked candidate moves: [(score, move, pv), ...], best first, scores from White's point of view
+    return iterative_deepening(game_state, time_limit, max_depth, tablebases=tablebases,
+                               verbose=verbose, multipv=multipv).lines
+
+class PonderSearch:
+    # A search running in a background thread on the position after the expected reply
+    def __init__(self, key, context):
+        self.key = key            # Zobrist key of the pondered position
+        self.context = context
+        self.stats = None         # set when the thread finishes
+        self.thread = None
+
+class Engine:
+    # Search state kept between the moves of one game: the transposition table (hash
+    # moves and scores from earlier searches), the evaluation cache and an optional
+    # ponder search on the opponent's expected reply, which think() continues on a ponder hit.
+    def __init__(self, book=None, tablebases=None, tt_size=200_000, eval_cache_size=1 << 16):
+        self.book = book
+        self.tablebases = tablebases
+        self.tt = TranspositionTable(tt_size)
+        self.eval_cache = EvalCache(eval_cache_size)
+        self.pondering = None
+
+    def think(self, game_state, time_limit=1.0, max_depth=None, verbose=True, multipv=1) -> SearchStats:
+        ponder, self.pondering = self.pondering, None
+        if ponder and multipv == 1 and ponder.key == game_state.zobrist_key():
+            # Ponder hit: the search already running on this position gets the move's time from now
+            ponder.context.deadline = time.perf_counter() + time_limit
+            ponder.thread.join()
+            stats = ponder.stats
+            if stats.source == "search":
+                stats.source = "ponder"
+            if verbose:
+                print(f"🧠 Ponder hit | {stats.summary()}")
+            return stats
+
+        if ponder:
+            self._stop(ponder)
+        context = SearchContext(tablebases=self.tablebases, tt=self.tt, eval_cache=self.eval_cache)
+        return iterative_deepening(game_state, time_limit, max_depth, self.book, self.tablebases,
+                                   verbose=verbose, context=context, multipv=multipv)
+
+    def expected_reply(self, game_state, stats):
+        # Opponent's move from the principal variation, else the hash move; call after playing stats.best_move
+        if len(stats.pv) > 1:
+            key = move_key(stats.pv[1])
+            return next((m for m in game_state.get_all_legal_moves() if move_key(m) == key), None)
+        return self.tt.best_move(game_state)
 
-    while True:
-        now = time.time()
-        if now - start_time >= time_limit:
-            break
+    def ponder(self, game_state, stats):
+        # Start thinking on the expected reply in the background; returns that move or None
+        self.stop_pondering()
+        reply = self.expected_reply(game_state, stats)
+        if reply is None:
+            return None
 
-        try:
-            eval_score, move = minimax(game_state, depth, float('-inf'), float('inf'), maximizing)
-        except TimeoutError:
-            break
+        position = copy.deepcopy(game_state)
+        position.push_move(next(m for m in position.get_all_legal_moves() if move_key(m) == move_key(reply)))
+        context = SearchContext(tablebases=self.tablebases, tt=self.tt, eval_cache=self.eval_cache)
+        search = PonderSearch(position.zobrist_key(), context)
 
-        if move:
-            best_move = move
+        def run():
+            search.stats = iterative_deepening(position, None, None, self.book, self.tablebases,
+                                               verbose=False, context=search.context)
 
-        if time.time() - start_time >= time_limit:
-            break
+        search.thread = threading.Thread(target=run, daemon=True)
+        search.thread.start()
+        self.pondering = search
+        return reply
 
-        depth += 1  # Try searching one level deeper
+    def stop_pondering(self):
+        if self.pondering:
+            self._stop(self.pondering)
+            self.pondering = None
 
-    print(f"⏱ Depth {depth} complete in {time.time() - start_time:.2f}s")
-    
-    return best_move
\ No newline at end of file
+    def _stop(self, search):
+        search.context.stopped = True
+        search.thread.join()
@@ -1,30 +1,27 @@
-from core.piece import PieceType, Color
+from array import array
 
-# --- Base Piece Values ---
-PIECE_VALUES = {
-    PieceType.PAWN: 100,
-    PieceType.KNIGHT: 320,
-    PieceType.BISHOP: 330,
-    PieceType.ROOK: 500,
-    PieceType.QUEEN: 900,
-    PieceType.KING: 0  # King isn't scored directly
-}
-
-# --- Piece-Square Table (example: pawns only for now) ---
-PAWN_TABLE = [
-    [0, 0, 0, 0, 0, 0, 0, 0],
-    [5, 10, 10, -20, -20, 10, 10, 5],
-    [5, -5, -10, 0, 0, -10, -5, 5],
-    [0, 0, 0, 20, 20, 0, 0, 0],
-    [5, 5, 10, 25, 25, 10, 5, 5],
-    [10, 10, 20, 30, 30, 20, 10, 10],
-    [50, 50, 50, 50, 50, 50, 50, 50],
-    [0, 0, 0, 0, 0, 0, 0, 0]
-]
-
-PIECE_SQUARE_TABLES = {
-    PieceType.PAWN: PAWN_TABLE
-}
+from core.piece import PieceType, Color
+from core.psqt import (  # re-exported: material, piece-square tables and phase values
+    PIECE_VALUES, EG_PIECE_VALUES, PIECE_SQUARE_TABLES, ENDGAME_PIECE_SQUARE_TABLES,
+    PHASE_WEIGHTS, MAX_PHASE, MG_TABLE, EG_TABLE, PHASE_TABLE,
+)
+
+def tapered_score(mg_score, eg_score, phase):
+    phase = min(phase, MAX_PHASE)
+    return (mg_score * phase + eg_score * (MAX_PHASE - phase)) // MAX_PHASE
+
+# --- Term Weights ---
+DOUBLED_PAWN_PENALTY = 15
+ISOLATED_PAWN_PENALTY = 10
+PASSED_PAWN_BONUS = 20
+KING_SHIELD_PENALTY = 15  # per missing pawn in front of the king
+MOBILITY_WEIGHT = 5
+# Read on every call, so engine.match may override exactly these (unlike the flat
+# tables in core.psqt, which are built once at import)
+TERM_WEIGHTS = (
+    "DOUBLED_PAWN_PENALTY", "ISOLATED_PAWN_PENALTY", "PASSED_PAWN_BONUS",
+    "KING_SHIELD_PENALTY", "MOBILITY_WEIGHT",
+)
 
 # --- Pawn Structure ---
 def is_doubled_pawn(board, col, color):
@@ -48,7 +45,7 @@ def is_isolated_pawn(board, row, col, color):
 def is_passed_pawn(board, row, col, color):
     direction = -1 if color == Color.WHITE else 1
     start = row + direction
-    end = -1 if color == Color.BLACK else 8
+    end = -1 if color == Color.WHITE else 8
     step = direction
 
     for r in range(start, end, step):
@@ -73,53 +70,44 @@ def king_safety_penalty(board, king_pos, color):
             if 0 <= c < 8:
                 piece = board.grid[shield_row][c]
                 if not (piece and piece.color == color and piece.type == PieceType.PAWN):
-                    penalty += 15
+                    penalty += KING_SHIELD_PENALTY
     return penalty
 
 # --- Mobility ---
 def mobility_score(game_state, color):
     legal_moves = game_state.get_all_legal_moves(color)
-    return len(legal_moves) * 5  # adjust weight if needed
+    return len(legal_moves) * MOBILITY_WEIGHT
 
-# --- Main Evaluation Function ---
-def evaluate_board(game_state):
-    board = game_state.board
-    score = 0
+# --- Static Terms (everything except mobility, from White's point of view) ---
+def static_score(board):
+    # Material + piece-square terms are kept up to date by Board.apply_move/undo_move
+    score = tapered_score(board.mg_score, board.eg_score, board.phase)
     white_king_pos = None
     black_king_pos = None
 
     for row in range(8):
         for col in range(8):
             piece = board.grid[row][col]
-            if piece:
-                value = PIECE_VALUES[piece.type]
-
-                # Piece-square table bonus
-                pst_bonus = 0
-                table = PIECE_SQUARE_TABLES.get(piece.type)
-                if table:
-                    pst_row = row if piece.color == Color.BLACK else 7 - row
-                    pst_bonus = table[pst_row][col]
+            if piece is None:
+                continue
 
-                # Pawn structure
+            # Pawn structure
+            if piece.type == PieceType.PAWN:
                 pawn_bonus = 0
-                if piece.type == PieceType.PAWN:
-                    if is_doubled_pawn(board, col, piece.color):
-                        pawn_bonus -= 15
-                    if is_isolated_pawn(board, row, col, piece.color):
-                        pawn_bonus -= 10
-                    if is_passed_pawn(board, row, col, piece.color):
-                        pawn_bonus += 20
-
-                piece_score = value + pst_bonus + pawn_bonus
-                score += piece_score if piece.color == Color.WHITE else -piece_score
-
-                # Store king position
-                if piece.type == PieceType.KING:
-                    if piece.color == Color.WHITE:
-                        white_king_pos = (row, col)
-                    else:
-                        black_king_pos = (row, col)
+                if is_doubled_pawn(board, col, piece.color):
+                    pawn_bonus -= DOUBLED_PAWN_PENALTY
+                if is_isolated_pawn(board, row, col, piece.color):
+                    pawn_bonus -= ISOLATED_PAWN_PENALTY
+                if is_passed_pawn(board, row, col, piece.color):
+                    pawn_bonus += PASSED_PAWN_BONUS
+                score += pawn_bonus if piece.color == Color.WHITE else -pawn_bonus
+
+            # Store king position
+            elif piece.type == PieceType.KING:
+                if piece.color == Color.WHITE:
+                    white_king_pos = (row, col)
+                else:
+                    black_king_pos = (row, col)
 
     # King safety penalty
     if white_king_pos:
@@ -127,9 +115,57 @@ def evaluate_board(game_state):
     if black_king_pos:
         score += king_safety_penalty(board, black_king_pos, Color.BLACK)
 
+    return score
+
+# --- Main Evaluation Function ---
+def evaluate_board(game_state):
+    score = static_score(game_state.board)
+
     # Mobility
     score += mobility_score(game_state, Color.WHITE)
     score -= mobility_score(game_state, Color.BLACK)
 
     # Normalize: always from perspective of current player
     return score if game_state.current_turn == Color.WHITE else -score
+
+# --- Evaluation Cache ---
+class EvalCache:
+    # Fixed-size, direct-mapped cache of evaluate_board results keyed by Zobrist key:
+    # the low hash bits pick the slot and a check word verifies the full key. The check
+    # word is key ^ score (lockless hashing), so a slot torn by a concurrent write fails
+    # verification instead of returning another position's score.
+    MASK64 = (1 << 64) - 1
+
+    def __init__(self, entries=1 << 16):
+        size = 1 << max(entries - 1, 1).bit_length()  # round up to a power of two
+        self.mask = size - 1
+        self.checks = array('Q', bytes(8 * size))
+        self.scores = array('q', bytes(8 * size))
+        self.hits = self.misses = 0
+
+    def __len__(self):
+        return len(self.scores)
+
+    @property
+    def hit_rate(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+    def probe(self, key):
+        slot = key & self.mask
+        score = self.scores[slot]
+        if self.checks[slot] ^ (score & self.MASK64) == key:
+            self.hits += 1
+            return score
+        self.misses += 1
+        return None
+
+    def store(self, key, score):
+        slot = key & self.mask
+        self.checks[slot] = key ^ (score & self.MASK64)
+        self.scores[slot] = score
+
+    def clear(self):
+        self.checks = array('Q', bytes(8 * len(self)))
+        self.scores = array('q', bytes(8 * len(self)))
+        self.hits = self.misses = 0
@@ -0,0 +1,325 @@
+import argparse
+import math
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from datetime import datetime
+
+from core.export import move_to_san
+from core.fen import START_FEN, game_from_fen
+from core.piece import Color
+from engine import evaluation
+from engine.bot import Engine
+
+# --- Adjudication ---
+MAX_PLIES = 300            # longer games are scored as draws
+RESIGN_SCORE = 1000        # centipawns, White's point of view
+RESIGN_PLIES = 6           # consecutive plies both engines must agree the game is lost
+
+# --- Engine Configurations ---
+class EngineConfig:
+    # One side of a match: search limits, optional book/tablebases and evaluation
+    # weight overrides (engine.evaluation.TERM_WEIGHTS, e.g. MOBILITY_WEIGHT).
+    def __init__(self, name, time_limit=0.1, max_depth=None, weights=None, book=None, tablebases=None):
+        self.name = name
+        self.time_limit = time_limit
+        self.max_depth = max_depth
+        self.weights = weights or {}
+        self.book = book
+        self.tablebases = tablebases
+        for key, value in self.weights.items():
+            if key not in evaluation.TERM_WEIGHTS:
+                raise ValueError(f"Unknown evaluation weight: {key} (choose from {', '.join(evaluation.TERM_WEIGHTS)})")
+
+    @classmethod
+    def parse(cls, spec: str) -> "EngineConfig":
+        # "name:time=0.2,depth=3,book=book.bin,tablebases=tb,MOBILITY_WEIGHT=8"
+        name, _, options = spec.partition(':')
+        kwargs, weights = {}, {}
+        for option in filter(None, options.split(',')):
+            key, _, value = option.partition('=')
+            if key == "time":
+                kwargs["time_limit"] = float(value)
+            elif key == "depth":
+                kwargs["max_depth"] = int(value)
+            elif key in ("book", "tablebases"):
+                kwargs[key] = value
+            else:
+                weights[key] = int(value)
+        return cls(name, weights=weights, **kwargs)
+
+    def __repr__(self):
+        return f"EngineConfig({self.name!r})"
+
+    def new_engine(self) -> Engine:
+        # Fresh search state for one game (no pondering: both sides share the CPU)
+        return Engine(_resource("book", self.book), _resource("tablebases", self.tablebases))
+
+_resources = {}  # per-process cache of opened books and tablebases, keyed by path
+
+def _resource(kind, path):
+    if path is None:
+        return None
+    if (kind, path) not in _resources:
+        if kind == "book":
+            from engine.book import OpeningBook
+            _resources[kind, path] = OpeningBook(path)
+        else:
+            from engine.tablebase import Tablebases
+            _resources[kind, path] = Tablebases(path)
+    return _resources[kind, path]
+
+def search_with(engine: EngineConfig, session: Engine, game_state):
+    saved = {key: getattr(evaluation, key) for key in engine.weights}
+    for key, value in engine.weights.items():
+        setattr(evaluation, key, value)
+    try:
+        return session.think(game_state, engine.time_limit, engine.max_depth, verbose=False)
+    finally:
+        for key, value in saved.items():
+            setattr(evaluation, key, value)
+
+# --- Playing ---
+def play_game(white: EngineConfig, black: EngineConfig, fen=START_FEN, max_plies=MAX_PLIES) -> dict:
+    game = game_from_fen(fen)
+    sessions = {Color.WHITE: white.new_engine(), Color.BLACK: black.new_engine()}
+    sans = []
+    adjudication_streak = 0  # signed: > 0 while White is winning by RESIGN_SCORE, < 0 for Black
+    result = reason = None
+
+    while result is None:
+        outcome = game.game_result()
+        if outcome:
+            result, reason = outcome
+        elif len(sans) >= max_plies:
+            result, reason = "1/2-1/2", "move limit"
+        elif abs(adjudication_streak) >= RESIGN_PLIES:
+            result = "1-0" if adjudication_streak > 0 else "0-1"
+            reason = "adjudication"
+        if result:
+            break
+
+        engine = white if game.current_turn == Color.WHITE else black
+        stats = search_with(engine, sessions[game.current_turn], game)
+        score = stats.score or 0
+        if score >= RESIGN_SCORE:
+            adjudication_streak = max(adjudication_streak, 0) + 1
+        elif score <= -RESIGN_SCORE:
+            adjudication_streak = min(adjudication_streak, 0) - 1
+        else:
+            adjudication_streak = 0
+
+        sans.append(move_to_san(stats.best_move, game))
+        game.make_move(stats.best_move, silent=True)
+
+    return {
+        "white": white.name,
+        "black": black.name,
+        "fen": fen,
+        "moves": sans,
+        "result": result,
+        "termination": reason,
+    }
+
+# --- Statistics ---
+def expected_score(elo: float) -> float:
+    return 1 / (1 + 10 ** (-elo / 400))
+
+def elo_from_score(score: float) -> float:
+    if score <= 0:
+        return float('-inf')
+    if score >= 1:
+        return float('inf')
+    return -400 * math.log10(1 / score - 1) + 0.0  # + 0.0 avoids printing -0.0
+
+class MatchStats:
+    # Win/draw/loss counts from the point of view of the first engine
+    def __init__(self, elo0=0.0, elo1=5.0, alpha=0.05, beta=0.05):
+        self.wins = self.draws = self.losses = 0
+        self.elo0, self.elo1 = elo0, elo1
+        self.lower = math.log(beta / (1 - alpha))
+        self.upper = math.log((1 - beta) / alpha)
+
+    @property
+    def games(self) -> int:
+        return self.wins + self.draws + self.losses
+
+    @property
+    def score(self) -> float:
+        return (self.wins + 0.5 * self.draws) / self.games if self.games else 0.5
+
+    @property
+    def variance(self) -> float:
+        # Per-game variance of the score
+        if not self.games:
+            return 0.0
+        s = self.score
+        return (self.wins * (1 - s) ** 2 + self.draws * (0.5 - s) ** 2 + self.losses * s ** 2) / self.games
+
+    @property
+    def elo(self) -> float:
+        return elo_from_score(self.score)
+
+    @property
+    def elo_margin(self) -> float:
+        # 95% confidence half-width
+        if not self.games:
+            return float('inf')
+        error = 1.96 * math.sqrt(self.variance / self.games)
+        return (elo_from_score(self.score + error) - elo_from_score(self.score - error)) / 2
+
+    @property
+    def llr(self) -> float:
+        # Generalized SPRT log-likelihood ratio of H1 (elo1) against H0 (elo0),
+        # normal approximation over the trinomial win/draw/loss outcome.
+        if not self.games or self.variance == 0:
+            return 0.0
+        s0, s1 = expected_score(self.elo0), expected_score(self.elo1)
+        return self.games * (s1 - s0) * (2 * self.score - s0 - s1) / (2 * self.variance)
+
+    @property
+    def sprt(self) -> str | None:
+        # "H1" accepted (stronger by elo1), "H0" accepted (not stronger than elo0), or still running
+        if self.llr >= self.upper:
+            return "H1"
+        if self.llr <= self.lower:
+            return "H0"
+        return None
+
+    def record(self, points: float):
+        if points == 1:
+            self.wins += 1
+        elif points == 0:
+            self.losses += 1
+        else:
+            self.draws += 1
+
+    def summary(self) -> str:
+        return (
+            f"{self.games} games: +{self.wins} ={self.draws} -{self.losses} "
+            f"| score {self.score:.1%} | Elo {self.elo:+.1f} ± {self.elo_margin:.1f} "
+            f"| LLR {self.llr:.2f} [{self.lower:.2f}, {self.upper:.2f}]"
+        )
+
+# --- PGN ---
+def game_to_pgn(game: dict, round_number: int) -> str:
+    headers = [
+        ("Event", "Self-play match"),
+        ("Site", "Local"),
+        ("Date", datetime.today().strftime("%Y.%m.%d")),
+        ("Round", str(round_number)),
+        ("White", game["white"]),
+        ("Black", game["black"]),
+        ("Result", game["result"]),
+    ]
+    if game["fen"] != START_FEN:
+        headers += [("SetUp", "1"), ("FEN", game["fen"])]
+    headers.append(("Termination", game["termination"]))
+
+    fields = game["fen"].split()
+    fullmove = int(fields[5]) if len(fields) > 5 else 1
+    black_first = len(fields) > 1 and fields[1] == 'b'
+
+    tokens = []
+    for i, san in enumerate(game["moves"]):
+        ply = i + black_first
+        if ply % 2 == 0:
+            tokens.append(f"{fullmove + ply // 2}.")
+        elif i == 0:
+            tokens.append(f"{fullmove}...")
+        tokens.append(san)
+    tokens.append(game["result"])
+
+    lines, line = [], ""
+    for token in tokens:
+        if line and len(line) + 1 + len(token) > 79:
+            lines.append(line)
+            line = token
+        else:
+            line = f"{line} {token}" if line else token
+    lines.append(line)
+
+    return '\n'.join(f'[{key} "{value}"]' for key, value in headers) + "\n\n" + '\n'.join(lines) + "\n\n"
+
+# --- Match Runner ---
+def load_openings(path: str) -> list[str]:
+    # One FEN or EPD per line; EPD lines get default move counters
+    openings = []
+    with open(path) as f:
+        for line in f:
+            line = line.split(';')[0].strip()
+            if not line or line.startswith('#'):
+                continue
+            fields = line.split()
+            if len(fields) < 6:
+                fields = fields[:4] + ["0", "1"]
+            openings.append(' '.join(fields))
+    return openings
+
+def points_for(game: dict, name: str) -> float:
+    if game["result"] == "1/2-1/2":
+        return 0.5
+    winner = game["white"] if game["result"] == "1-0" else game["black"]
+    return 1.0 if winner == name else 0.0
+
+def run_match(engine, baseline, games=100, openings=None, concurrency=1, pgn_path=None,
+              max_plies=MAX_PLIES, stats=None, stop_on_sprt=True, verbose=True) -> MatchStats:
+    # Plays `engine` against `baseline`, each opening twice with colours swapped.
+    if engine.name == baseline.name:
+        raise ValueError("Engines need distinct names")
+    openings = openings or [START_FEN]
+    stats = stats or MatchStats()
+    pgn = open(pgn_path, 'w') if pgn_path else None
+
+    executor = ProcessPoolExecutor(max_workers=concurrency)
+    try:
+        futures = {}
+        for i in range(games):
+            fen = openings[(i // 2) % len(openings)]
+            white, black = (engine, baseline) if i % 2 == 0 else (baseline, engine)
+            futures[executor.submit(play_game, white, black, fen, max_plies)] = i + 1
+
+        for future in as_completed(futures):
+            game = future.result()
+            stats.record(points_for(game, engine.name))
+            if pgn:
+                pgn.write(game_to_pgn(game, futures[future]))
+                pgn.flush()
+            if verbose:
+                print(f"Game {futures[future]}: {game['white']} - {game['black']} "
+                      f"{game['result']} ({game['termination']}) | {stats.summary()}")
+            if stop_on_sprt and stats.sprt:
+                if verbose:
+                    print(f"SPRT finished: {stats.sprt} accepted")
+                break
+    finally:
+        executor.shutdown(cancel_futures=True)
+        if pgn:
+            pgn.close()
+    return stats
+
+if __name__ == "__main__":
+    # python -m engine.match "new:depth=2,MOBILITY_WEIGHT=8" "base:depth=2" --games 200 --concurrency 4
+    parser = argparse.ArgumentParser(description="Engine-vs-engine self-play match")
+    parser.add_argument("engine", help='engine under test, e.g. "new:time=0.2,MOBILITY_WEIGHT=8"')
+    parser.add_argument("baseline", help='reference engine, e.g. "base:time=0.2"')
+    parser.add_argument("--games", type=int, default=100)
+    parser.add_argument("--concurrency", type=int, default=1)
+    parser.add_argument("--openings", help="file with one FEN/EPD per line")
+    parser.add_argument("--pgn", default="match.pgn")
+    parser.add_argument("--max-plies", type=int, default=MAX_PLIES)
+    parser.add_argument("--elo0", type=float, default=0.0)
+    parser.add_argument("--elo1", type=float, default=5.0)
+    parser.add_argument("--alpha", type=float, default=0.05)
+    parser.add_argument("--beta", type=float, default=0.05)
+    args = parser.parse_args()
+
+    result = run_match(
+        EngineConfig.parse(args.engine), EngineConfig.parse(args.baseline),
+        games=args.games,
+        openings=load_openings(args.openings) if args.openings else None,
+        concurrency=args.concurrency,
+        pgn_path=args.pgn,
+        max_plies=args.max_plies,
+        stats=MatchStats(args.elo0, args.elo1, args.alpha, args.beta),
+    )
+    print(result.summary())
+    print(f"✅ Games written to {args.pgn}")
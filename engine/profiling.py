@@ -0,0 +1,84 @@
+import time
+from collections import defaultdict
+
+from core.board import Board
+from core.game_state import GameState
+from engine import evaluation, search
+
+# (owner, attribute) pairs wrapped while profiling. Functions imported by name into
+# other modules (search.evaluate_board) are listed there too so every call is seen.
+HOT_FUNCTIONS = [
+    (Board, "generate_pseudo_legal_moves"),
+    (Board, "apply_move"),
+    (Board, "undo_move"),
+    (Board, "is_square_attacked"),
+    (Board, "find_king"),
+    (GameState, "get_all_legal_moves"),
+    (GameState, "is_in_check"),
+    (GameState, "push_move"),
+    (GameState, "pop_move"),
+    (evaluation, "evaluate_board"),
+    (search, "evaluate_board"),
+    (evaluation, "static_score"),
+    (evaluation, "mobility_score"),
+    (search, "order_moves"),
+    (search, "quiescence_search"),
+]
+
+class HotFunctionProfiler:
+    # Opt-in: wraps HOT_FUNCTIONS only between __enter__ and __exit__, so normal
+    # searches pay nothing. Records calls, own time (excluding other profiled
+    # functions) and total time (outermost call only, so recursion isn't double counted).
+    def __init__(self, targets=None):
+        self.targets = targets or HOT_FUNCTIONS
+        self.calls = defaultdict(int)
+        self.own = defaultdict(float)
+        self.total = defaultdict(float)
+        self._active = defaultdict(int)
+        self._stack = []
+        self._originals = []
+
+    def _wrap(self, label, func):
+        def wrapper(*args, **kwargs):
+            self._stack.append(0.0)
+            self._active[label] += 1
+            start = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                elapsed = time.perf_counter() - start
+                children = self._stack.pop()
+                self._active[label] -= 1
+                self.calls[label] += 1
+                self.own[label] += elapsed - children
+                if not self._active[label]:
+                    self.total[label] += elapsed
+                if self._stack:
+                    self._stack[-1] += elapsed
+        wrapper.__wrapped__ = func
+        return wrapper
+
+    def __enter__(self):
+        for owner, name in self.targets:
+            func = getattr(owner, name)
+            label = f"{func.__module__}.{func.__qualname__}"
+            self._originals.append((owner, name, func))
+            setattr(owner, name, self._wrap(label, func))
+        return self
+
+    def __exit__(self, *exc):
+        for owner, name, func in reversed(self._originals):
+            setattr(owner, name, func)
+        self._originals = []
+
+    def report(self) -> dict:
+        return {
+            label: (self.calls[label], self.own[label], self.total[label])
+            for label in sorted(self.calls, key=lambda l: self.own[l], reverse=True)
+        }
+
+def format_profile(profile: dict) -> str:
+    lines = [f"{'function':<52} {'calls':>9} {'own s':>8} {'total s':>8}"]
+    for label, (calls, own, total) in profile.items():
+        lines.append(f"{label:<52} {calls:>9} {own:>8.3f} {total:>8.3f}")
+    return '\n'.join(lines)
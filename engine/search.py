@@ -1,6 +1,170 @@
+import time
 from engine.evaluation import PIECE_VALUES, evaluate_board
 from core.piece import Color
 
+MATE_SCORE = 100000
+MATE_THRESHOLD = MATE_SCORE - 1000  # scores beyond this are mates
+
+# Transposition table bounds (White's point of view)
+EXACT, LOWER, UPPER = 0, 1, 2
+
+class SearchAborted(Exception):
+    # Raised inside the tree when the search is stopped or runs out of time
+    pass
+
+class SearchStats:
+    # Counters and results of one search, filled in as it runs
+    def __init__(self):
+        self.nodes = 0             # minimax nodes
+        self.qnodes = 0            # quiescence nodes
+        self.cutoffs = 0
+        self.first_move_cutoffs = 0
+        self.tt_hits = 0           # nodes answered by the transposition table
+        self.depth = 0             # deepest completed iteration
+        self.score = None          # White's point of view
+        self.best_move = None
+        self.pv = []
+        self.lines = []            # MultiPV: [(score, move, pv), ...] best first
+        self.iterations = []       # one dict per completed depth
+        self.elapsed = 0.0
+        self.source = "search"     # or "book" / "tablebase" / "ponder" (continued ponder search)
+        self.profile = None        # {function: (calls, own seconds, total seconds)} when profiling
+
+    @property
+    def total_nodes(self) -> int:
+        return self.nodes + self.qnodes
+
+    @property
+    def nps(self) -> int:
+        return int(self.total_nodes / self.elapsed) if self.elapsed > 0 else 0
+
+    @property
+    def first_move_cutoff_rate(self) -> float:
+        return self.first_move_cutoffs / self.cutoffs if self.cutoffs else 0.0
+
+    @property
+    def branching_factor(self) -> float:
+        # Effective branching factor: node growth between the last two iterations
+        if len(self.iterations) < 2 or not self.iterations[-2]["nodes"]:
+            return 0.0
+        return self.iterations[-1]["nodes"] / self.iterations[-2]["nodes"]
+
+    def record_iteration(self, depth, score, best_move, pv, seconds):
+        previous = sum(it["nodes"] for it in self.iterations)
+        self.iterations.append({
+            "depth": depth,
+            "score": score,
+            "move": repr(best_move) if best_move else None,
+            "pv": [repr(m) for m in pv],
+            "nodes": self.total_nodes - previous,
+            "seconds": seconds,
+        })
+        self.depth, self.score, self.best_move, self.pv = depth, score, best_move, list(pv)
+
+    def as_dict(self) -> dict:
+        return {
+            "source": self.source,
+            "move": repr(self.best_move) if self.best_move else None,
+            "score": self.score,
+            "depth": self.depth,
+            "pv": [repr(m) for m in self.pv],
+            "lines": [
+                {"score": score, "move": repr(move), "pv": [repr(m) for m in pv]}
+                for score, move, pv in self.lines
+            ],
+            "nodes": self.nodes,
+            "qnodes": self.qnodes,
+            "tt_hits": self.tt_hits,
+            "nps": self.nps,
+            "elapsed": self.elapsed,
+            "branching_factor": self.branching_factor,
+            "first_move_cutoff_rate": self.first_move_cutoff_rate,
+            "iterations": self.iterations,
+        }
+
+    def summary(self) -> str:
+        pv = ' '.join(repr(m) for m in self.pv)
+        return (
+            f"depth {self.depth} score {self.score} | {self.nodes} nodes + {self.qnodes} qnodes "
+            f"in {self.elapsed:.2f}s ({self.nps} nps) | {self.tt_hits} TT hits | EBF {self.branching_factor:.1f} "
+            f"| first-move cutoffs {self.first_move_cutoff_rate:.0%} | pv {pv}"
+        )
+
+def move_key(move):
+    # Identifies a move across positions and Move objects
+    return (move.from_pos, move.to_pos, move.promotion) if move else None
+
+class TranspositionTable:
+    # Zobrist key -> (depth, score, bound, move key, generation). Kept between searches
+    # (and moves) by engine.bot.Engine. Scores are White's point of view, with mate
+    # scores stored relative to the node so they stay valid at any ply.
+    def __init__(self, max_entries=200_000):
+        self.entries = {}
+        self.max_entries = max_entries
+        self.generation = 0
+
+    def __len__(self):
+        return len(self.entries)
+
+    def new_search(self):
+        self.generation += 1
+
+    def clear(self):
+        self.entries.clear()
+
+    def probe(self, key, ply):
+        entry = self.entries.get(key)
+        if entry is None:
+            return None
+        depth, score, bound, move, _ = entry
+        if score > MATE_THRESHOLD:
+            score -= ply
+        elif score < -MATE_THRESHOLD:
+            score += ply
+        return depth, score, bound, move
+
+    def store(self, key, depth, score, bound, move, ply):
+        old = self.entries.get(key)
+        if old is None and len(self.entries) >= self.max_entries:
+            self._make_room()
+        elif old and old[0] > depth and old[4] == self.generation:
+            return  # keep the deeper result from this search
+        if score > MATE_THRESHOLD:
+            score += ply
+        elif score < -MATE_THRESHOLD:
+            score -= ply
+        self.entries[key] = (depth, score, bound, move, self.generation)
+
+    def _make_room(self):
+        # Drop entries from earlier searches; start over if that frees too little
+        stale = [key for key, entry in self.entries.items() if entry[4] != self.generation]
+        for key in stale:
+            del self.entries[key]
+        if len(self.entries) >= self.max_entries * 0.9:
+            self.entries.clear()
+
+    def best_move(self, game_state):
+        entry = self.entries.get(game_state.zobrist_key())
+        if entry is None:
+            return None
+        return next((m for m in game_state.get_all_legal_moves() if move_key(m) == entry[3]), None)
+
+class SearchContext:
+    # Per-search resources shared by every node
+    def __init__(self, tablebases=None, stats=None, tt=None, deadline=None, eval_cache=None):
+        self.tablebases = tablebases
+        self.stats = stats or SearchStats()
+        self.tt = tt
+        self.eval_cache = eval_cache
+        self.pv = {}  # ply -> best line found from that ply
+        self.deadline = deadline  # time.perf_counter() value, or None for no limit
+        self.stopped = False      # set from another thread to abort (pondering)
+
+    def check_stop(self):
+        # The deadline only applies once an iteration has completed, so there is always a move
+        if self.stopped or (self.deadline is not None and self.stats.depth and time.perf_counter() >= self.deadline):
+            raise SearchAborted
+
 def mvv_lva_score(move):
     if not move.captured:
         return 0
@@ -8,9 +172,15 @@ def mvv_lva_score(move):
     attacker_value = PIECE_VALUES.get(move.piece.type, 1)
     return victim_value * 10 - attacker_value  
 
-def order_moves(moves):
-    # Captures first, sorted by MVV-LVA
-    return sorted(moves, key=mvv_lva_score, reverse=True)
+def order_moves(moves, first=None):
+    # Hash move (by move_key) first, then captures sorted by MVV-LVA
+    ordered = sorted(moves, key=mvv_lva_score, reverse=True)
+    if first:
+        for i, move in enumerate(ordered):
+            if move_key(move) == first:
+                ordered.insert(0, ordered.pop(i))
+                break
+    return ordered
 
 def is_quiet_position(game_state) -> bool:
     for move in game_state.get_all_legal_moves():
@@ -18,53 +188,174 @@ def is_quiet_position(game_state) -> bool:
             return False
     return True
 
-def minimax(game_state, depth, alpha, beta, maximizing_player):
-    if depth == 0 or game_state.is_game_over():
-        quiet_score = quiescence_search(game_state, alpha, beta, maximizing_player)
+def white_score(game_state, context=None):
+    # evaluate_board is side-to-move relative; minimax scores from White's point of view
+    cache = context.eval_cache if context else None
+    if cache is None:
+        score = evaluate_board(game_state)
+    else:
+        key = game_state.hash_stack[-1]
+        score = cache.probe(key)
+        if score is None:
+            score = evaluate_board(game_state)
+            cache.store(key, score)
+    return score if game_state.current_turn == Color.WHITE else -score
+
+def tablebase_score(game_state, context, ply):
+    if context.tablebases is None:
+        return None
+    result = context.tablebases.probe(game_state)
+    if result is None:
+        return None
+    wdl, plies = result
+    score = wdl * (MATE_SCORE - ply - plies) if wdl else 0
+    return score if game_state.current_turn == Color.WHITE else -score
+
+def record_cutoff(stats, move_number):
+    stats.cutoffs += 1
+    if move_number == 0:
+        stats.first_move_cutoffs += 1
+
+def format_score(score) -> str:
+    # Centipawns as pawns ("+0.35"), mates as "#3" / "#-2" (moves, White's point of view)
+    if score is None:
+        return "?"
+    if abs(score) > MATE_THRESHOLD:
+        moves = (MATE_SCORE - abs(score) + 1) // 2
+        return f"#{moves}" if score > 0 else f"#-{moves}"
+    return f"{score / 100:+.2f}"
+
+def search_lines(game_state, depth, maximizing_player, context, count=1):
+    # MultiPV: the best `count` root moves with score and PV. Each pass searches the root
+    # with the moves already found excluded, sharing the context's transposition table.
+    lines, excluded = [], set()
+    for _ in range(count):
+        score, move = minimax(game_state, depth, float('-inf'), float('inf'), maximizing_player,
+                              context, exclude=excluded)
+        if move is None:
+            break
+        lines.append((score, move, complete_pv(game_state, context.pv.get(0, []), context.tt, depth)))
+        excluded.add(move_key(move))
+    return lines
+
+def complete_pv(game_state, pv, tt, length):
+    # The triangular PV stops where a child was answered by the transposition table;
+    # follow the stored hash moves from there up to `length` plies.
+    if tt is None or len(pv) >= length:
+        return pv
+    line = list(pv)
+    for move in line:
+        game_state.push_move(move)
+    while len(line) < length and not game_state.is_draw():
+        move = tt.best_move(game_state)
+        if move is None:
+            break
+        line.append(move)
+        game_state.push_move(move)
+    for move in reversed(line):
+        game_state.pop_move(move)
+    return line
+
+def minimax(game_state, depth, alpha, beta, maximizing_player, context=None, ply=0, exclude=None):
+    # exclude: move keys skipped at this (root) node, for MultiPV
+    if context is None:
+        context = SearchContext()
+    context.check_stop()
+    context.stats.nodes += 1
+    context.pv[ply] = []
+
+    if ply > 0:
+        if game_state.is_draw(ply):
+            return 0, None
+        tb_score = tablebase_score(game_state, context, ply)
+        if tb_score is not None:
+            return tb_score, None
+
+    if depth == 0:
+        quiet_score = quiescence_search(game_state, alpha, beta, maximizing_player, context=context)
         return quiet_score, None
 
+    key = game_state.hash_stack[-1]
+    tt_move = None
+    if context.tt is not None:
+        entry = context.tt.probe(key, ply)
+        if entry:
+            tt_depth, tt_score, bound, tt_move = entry
+            if ply > 0 and tt_depth >= depth and (
+                bound == EXACT
+                or (bound == LOWER and tt_score >= beta)
+                or (bound == UPPER and tt_score <= alpha)
+            ):
+                context.stats.tt_hits += 1
+                return tt_score, None
+    alpha_orig, beta_orig = alpha, beta
+
     best_move = None
-    legal_moves = order_moves(game_state.get_all_legal_moves())
+    legal_moves = order_moves(game_state.get_all_legal_moves(), tt_move)
     if not legal_moves:
-        return evaluate_board(game_state), None
+        if game_state.is_in_check(game_state.current_turn):
+            # Checkmated: nearer mates score higher for the winner
+            mate = MATE_SCORE - ply
+            return (-mate if maximizing_player else mate), None
+        return 0, None  # Stalemate
+    if exclude:
+        legal_moves = [m for m in legal_moves if move_key(m) not in exclude]
+        if not legal_moves:
+            return 0, None
 
     if maximizing_player:
-        max_eval = float('-inf')
-        for move in legal_moves:
-            game_state.board.apply_move(move)
-            eval, _ = minimax(game_state, depth - 1, alpha, beta, False)
-            game_state.board.undo_move(move)
-
-            if eval > max_eval:
-                max_eval = eval
+        best_eval = float('-inf')
+        for i, move in enumerate(legal_moves):
+            game_state.push_move(move)
+            try:
+                eval, _ = minimax(game_state, depth - 1, alpha, beta, False, context, ply + 1)
+            finally:
+                game_state.pop_move(move)
+
+            if eval > best_eval:
+                best_eval = eval
                 best_move = move
+                context.pv[ply] = [move] + context.pv.get(ply + 1, [])
 
             alpha = max(alpha, eval)
             if beta <= alpha:
+                record_cutoff(context.stats, i)
                 break  # Beta cutoff
-        return max_eval, best_move
+        bound = LOWER if best_eval >= beta else UPPER if best_eval <= alpha_orig else EXACT
 
     else:
-        min_eval = float('inf')
-        for move in legal_moves:
-            game_state.board.apply_move(move)
-            eval, _ = minimax(game_state, depth - 1, alpha, beta, True)
-            game_state.board.undo_move(move)
-
-            if eval < min_eval:
-                min_eval = eval
+        best_eval = float('inf')
+        for i, move in enumerate(legal_moves):
+            game_state.push_move(move)
+            try:
+                eval, _ = minimax(game_state, depth - 1, alpha, beta, True, context, ply + 1)
+            finally:
+                game_state.pop_move(move)
+
+            if eval < best_eval:
+                best_eval = eval
                 best_move = move
+                context.pv[ply] = [move] + context.pv.get(ply + 1, [])
 
             beta = min(beta, eval)
             if beta <= alpha:
+                record_cutoff(context.stats, i)
                 break  # Alpha cutoff
-        return min_eval, best_move
-    
-def quiescence_search(game_state, alpha, beta, maximizing_player, depth=4):
-    if depth == 0 or game_state.is_game_over():
-        return evaluate_board(game_state)
+        bound = UPPER if best_eval <= alpha else LOWER if best_eval >= beta_orig else EXACT
+
+    if context.tt is not None and not exclude:
+        context.tt.store(key, depth, best_eval, bound, move_key(best_move), ply)
+    return best_eval, best_move
+
+def quiescence_search(game_state, alpha, beta, maximizing_player, depth=4, context=None):
+    if context is None:
+        context = SearchContext()
+    context.check_stop()
+    context.stats.qnodes += 1
 
-    stand_pat = evaluate_board(game_state)
+    stand_pat = white_score(game_state, context)
+    if depth == 0:
+        return stand_pat
 
     if maximizing_player:
         if stand_pat >= beta:
@@ -80,9 +371,11 @@ def quiescence_search(game_state, alpha, beta, maximizing_player, depth=4):
         if not move.captured:
             continue
 
-        game_state.board.apply_move(move)
-        score = quiescence_search(game_state, alpha, beta, not maximizing_player, depth - 1)
-        game_state.board.undo_move(move)
+        game_state.push_move(move)
+        try:
+            score = quiescence_search(game_state, alpha, beta, not maximizing_player, depth - 1, context)
+        finally:
+            game_state.pop_move(move)
 
         if maximizing_player:
             if score > alpha:
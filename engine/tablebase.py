@@ -0,0 +1,544 @@
+import os
+import sys
+import time
+import zlib
+from collections import defaultdict
+
+from core.piece import Color, PieceType
+
+# --- Value Encoding (one byte per position, side-to-move relative) ---
+# 0        draw (or not yet resolved during generation)
+# 1..127   side to move mates in N plies
+# 128..254 side to move is mated in (value - 128) plies
+# 255      illegal / unreachable index
+DRAW = 0
+LOSS_BASE = 128
+ILLEGAL = 255
+MAX_PLIES = 126
+
+WHITE, BLACK = 0, 1
+KIND_ORDER = "QRBNP"  # non-king pieces, strongest first
+PIECE_RANK = {kind: i for i, kind in enumerate('K' + KIND_ORDER)}
+KIND_VALUES = {'Q': 9, 'R': 5, 'B': 3, 'N': 3, 'P': 1}
+KIND_OF_TYPE = {
+    PieceType.KING: 'K', PieceType.QUEEN: 'Q', PieceType.ROOK: 'R',
+    PieceType.BISHOP: 'B', PieceType.KNIGHT: 'N', PieceType.PAWN: 'P',
+}
+TRIVIAL_DRAWS = {"KvK", "KBvK", "KNvK"}  # Insufficient material, no table needed
+FILE_MAGIC = b"CTB1"
+FILE_SUFFIX = ".tb"
+
+DEFAULT_SIGNATURES = [
+    "KQvK", "KRvK", "KPvK",
+    "KQvKQ", "KQvKR", "KQvKB", "KQvKN", "KQvKP",
+    "KRvKR", "KRvKB", "KRvKN", "KRvKP",
+    "KBvKP", "KNvKP", "KPvKP",
+    "KQQvK", "KQRvK", "KQBvK", "KQNvK", "KQPvK",
+    "KRRvK", "KRBvK", "KRNvK", "KRPvK",
+    "KBBvK", "KBNvK", "KBPvK", "KNNvK", "KNPvK", "KPPvK",
+]
+
+def decode_value(value: int) -> tuple[int, int]:
+    # -> (wdl, plies): wdl is 1 win, 0 draw, -1 loss for the side to move
+    if value == DRAW:
+        return 0, 0
+    if value < LOSS_BASE:
+        return 1, value
+    return -1, value - LOSS_BASE
+
+# --- Geometry (squares are row * 8 + col, as in Board.grid) ---
+def _targets(offsets):
+    table = []
+    for sq in range(64):
+        r, c = divmod(sq, 8)
+        table.append([(r + dr) * 8 + c + dc for dr, dc in offsets if 0 <= r + dr < 8 and 0 <= c + dc < 8])
+    return table
+
+def _rays(directions):
+    table = []
+    for sq in range(64):
+        r, c = divmod(sq, 8)
+        rays = []
+        for dr, dc in directions:
+            ray = []
+            nr, nc = r + dr, c + dc
+            while 0 <= nr < 8 and 0 <= nc < 8:
+                ray.append(nr * 8 + nc)
+                nr += dr
+                nc += dc
+            rays.append(ray)
+        table.append(rays)
+    return table
+
+def _mask(squares):
+    mask = 0
+    for sq in squares:
+        mask |= 1 << sq
+    return mask
+
+STRAIGHT = [(0, 1), (0, -1), (1, 0), (-1, 0)]
+DIAGONAL = [(1, 1), (1, -1), (-1, 1), (-1, -1)]
+KNIGHT_TARGETS = _targets([(2, 1), (1, 2), (-1, 2), (-2, 1), (-2, -1), (-1, -2), (1, -2), (2, -1)])
+KING_TARGETS = _targets(STRAIGHT + DIAGONAL)
+KNIGHT_MASK = [_mask(t) for t in KNIGHT_TARGETS]
+KING_MASK = [_mask(t) for t in KING_TARGETS]
+SLIDER_RAYS = {'R': _rays(STRAIGHT), 'B': _rays(DIAGONAL), 'Q': _rays(STRAIGHT + DIAGONAL)}
+STEP_TARGETS = {'K': KING_TARGETS, 'N': KNIGHT_TARGETS}
+
+# White pawns move towards row 0, black pawns towards row 7
+PAWN_STEP = (-8, 8)
+PAWN_START_ROW = (6, 1)
+PAWN_CAPTURES = (_targets([(-1, -1), (-1, 1)]), _targets([(1, -1), (1, 1)]))
+PAWN_ATTACK_MASK = ([_mask(t) for t in PAWN_CAPTURES[WHITE]], [_mask(t) for t in PAWN_CAPTURES[BLACK]])
+
+# ALIGNMENT[a * 64 + b]: 1 same rank/file, 2 same diagonal; BETWEEN: squares strictly between
+ALIGNMENT = [0] * 4096
+BETWEEN = [0] * 4096
+for _a in range(64):
+    for _kind, _value in (('R', 1), ('B', 2)):
+        for _ray in SLIDER_RAYS[_kind][_a]:
+            for _i, _b in enumerate(_ray):
+                ALIGNMENT[_a * 64 + _b] = _value
+                BETWEEN[_a * 64 + _b] = _mask(_ray[:_i])
+
+# --- Symmetry ---
+# Pawnless tables put the white king in the a1-d1-d4 triangle (8 symmetries),
+# tables with pawns only mirror files so the white king is on files a-d.
+def _transform(f):
+    return [f(r, c)[0] * 8 + f(r, c)[1] for r in range(8) for c in range(8)]
+
+TRANSFORMS = [_transform(f) for f in (
+    lambda r, c: (r, c), lambda r, c: (r, 7 - c), lambda r, c: (7 - r, c), lambda r, c: (7 - r, 7 - c),
+    lambda r, c: (c, r), lambda r, c: (c, 7 - r), lambda r, c: (7 - c, r), lambda r, c: (7 - c, 7 - r),
+)]
+
+PAWNLESS_REGION = [sq for sq in range(64) if sq % 8 <= 3 and 7 - sq // 8 <= sq % 8]
+PAWN_REGION = [sq for sq in range(64) if sq % 8 <= 3]
+DIAGONAL_MIRROR = TRANSFORMS[7]
+A1_H8_DIAGONAL = {sq for sq in range(64) if DIAGONAL_MIRROR[sq] == sq}
+KING_TRANSFORM = [
+    next(t for t, transform in enumerate(TRANSFORMS) if transform[sq] in PAWNLESS_REGION)
+    for sq in range(64)
+]
+
+# --- Material Signatures ---
+def make_signature(white_kinds, black_kinds) -> str:
+    def side(kinds):
+        return 'K' + ''.join(sorted((k for k in kinds if k != 'K'), key=KIND_ORDER.index))
+    return f"{side(white_kinds)}v{side(black_kinds)}"
+
+def _side_strength(kinds: str):
+    return (sum(KIND_VALUES.get(k, 0) for k in kinds), len(kinds), [-KIND_ORDER.index(k) for k in kinds[1:]])
+
+def normalize_signature(signature: str) -> tuple[str, bool]:
+    # The stronger side is always stored as white; returns (signature, colors_flipped)
+    white, black = signature.split('v')
+    if _side_strength(black) > _side_strength(white):
+        return f"{black}v{white}", True
+    return signature, False
+
+class TableSpec:
+    def __init__(self, signature: str):
+        self.signature = signature
+        white, black = signature.split('v')
+        self.colors = [WHITE] * len(white) + [BLACK] * len(black)
+        self.kinds = list(white) + list(black)
+        self.count = len(self.kinds)
+        self.black_king = len(white)
+        self.has_pawns = 'P' in self.kinds
+        # Runs of identical pieces (e.g. the rooks of KRRvK) are stored in sorted square order
+        self.runs = []
+        start = 0
+        for i in range(1, self.count + 1):
+            if i == self.count or (self.colors[i], self.kinds[i]) != (self.colors[start], self.kinds[start]):
+                if i - start > 1:
+                    self.runs.append((start, i))
+                start = i
+        self.region = PAWN_REGION if self.has_pawns else PAWNLESS_REGION
+        self.region_index = {sq: i for i, sq in enumerate(self.region)}
+        self.stride = 64 ** (self.count - 1)
+        self.size = 2 * len(self.region) * self.stride
+
+    def index(self, stm: int, sqs: list[int]) -> int:
+        wk = sqs[0]
+        if self.has_pawns:
+            if wk & 7 > 3:
+                sqs = [sq ^ 7 for sq in sqs]
+        else:
+            transform = TRANSFORMS[KING_TRANSFORM[wk]]
+            sqs = [transform[sq] for sq in sqs]
+        sqs = self._sort_runs(sqs)
+        if not self.has_pawns and sqs[0] in A1_H8_DIAGONAL:
+            # Both the position and its diagonal mirror keep the king in the triangle
+            sqs = min(sqs, self._sort_runs([DIAGONAL_MIRROR[sq] for sq in sqs]))
+
+        idx = stm * len(self.region) + self.region_index[sqs[0]]
+        for sq in sqs[1:]:
+            idx = idx * 64 + sq
+        return idx
+
+    def _sort_runs(self, sqs: list[int]) -> list[int]:
+        if not self.runs:
+            return sqs
+        sqs = list(sqs)
+        for start, end in self.runs:
+            sqs[start:end] = sorted(sqs[start:end])
+        return sqs
+
+    def decode(self, idx: int) -> tuple[int, list[int]]:
+        sqs = []
+        for _ in range(self.count - 1):
+            idx, sq = divmod(idx, 64)
+            sqs.append(sq)
+        stm, king = divmod(idx, len(self.region))
+        sqs.append(self.region[king])
+        sqs.reverse()
+        return stm, sqs
+
+    def attacked(self, target: int, by: int, sqs: list[int], occupied: int) -> bool:
+        colors, kinds = self.colors, self.kinds
+        for i, sq in enumerate(sqs):
+            if sq < 0 or colors[i] != by:
+                continue
+            kind = kinds[i]
+            if kind == 'N':
+                if KNIGHT_MASK[sq] >> target & 1:
+                    return True
+            elif kind == 'K':
+                if KING_MASK[sq] >> target & 1:
+                    return True
+            elif kind == 'P':
+                if PAWN_ATTACK_MASK[by][sq] >> target & 1:
+                    return True
+            else:
+                line = ALIGNMENT[sq * 64 + target]
+                if line and (kind == 'Q' or (kind == 'R') == (line == 1)) and not BETWEEN[sq * 64 + target] & occupied:
+                    return True
+        return False
+
+    def king_square(self, color: int, sqs: list[int]) -> int:
+        return sqs[0] if color == WHITE else sqs[self.black_king]
+
+    def is_legal(self, stm: int, sqs: list[int]) -> bool:
+        if len(set(sqs)) != self.count:
+            return False
+        for i, sq in enumerate(sqs):
+            if self.kinds[i] == 'P' and sq // 8 in (0, 7):
+                return False
+        if KING_MASK[sqs[0]] >> sqs[self.black_king] & 1:
+            return False
+        # The side that just moved may not be left in check
+        return not self.attacked(self.king_square(1 - stm, sqs), stm, sqs, _mask(sqs))
+
+    def in_check(self, stm: int, sqs: list[int]) -> bool:
+        return self.attacked(self.king_square(stm, sqs), 1 - stm, sqs, _mask(sqs))
+
+    def moves(self, stm: int, sqs: list[int]):
+        # Yields (new_squares, captured_index or None, promotion_kind or None) for legal moves.
+        # En passant is not modelled: tables assume no en passant capture is available.
+        occupied = {sq: i for i, sq in enumerate(sqs)}
+        colors, kinds = self.colors, self.kinds
+        for i, sq in enumerate(sqs):
+            if colors[i] != stm:
+                continue
+            kind = kinds[i]
+            targets = []
+            if kind in STEP_TARGETS:
+                for to in STEP_TARGETS[kind][sq]:
+                    other = occupied.get(to)
+                    if other is None or colors[other] != stm:
+                        targets.append((to, other))
+            elif kind == 'P':
+                to = sq + PAWN_STEP[stm]
+                if to not in occupied:
+                    targets.append((to, None))
+                    double = to + PAWN_STEP[stm]
+                    if sq // 8 == PAWN_START_ROW[stm] and double not in occupied:
+                        targets.append((double, None))
+                for to in PAWN_CAPTURES[stm][sq]:
+                    other = occupied.get(to)
+                    if other is not None and colors[other] != stm:
+                        targets.append((to, other))
+            else:
+                for ray in SLIDER_RAYS[kind][sq]:
+                    for to in ray:
+                        other = occupied.get(to)
+                        if other is None:
+                            targets.append((to, None))
+                            continue
+                        if colors[other] != stm:
+                            targets.append((to, other))
+                        break
+
+            for to, captured in targets:
+                if captured is not None and kinds[captured] == 'K':
+                    continue
+                new_sqs = list(sqs)
+                new_sqs[i] = to
+                if captured is not None:
+                    new_sqs[captured] = -1
+                occ = 0
+                for s in new_sqs:
+                    if s >= 0:
+                        occ |= 1 << s
+                if self.attacked(self.king_square(stm, new_sqs), 1 - stm, new_sqs, occ):
+                    continue
+                if kind == 'P' and to // 8 in (0, 7):
+                    for promotion in "QRBN":
+                        yield new_sqs, captured, promotion
+                else:
+                    yield new_sqs, captured, None
+
+    def unmoves(self, stm: int, sqs: list[int]):
+        # Squares the side that just moved could have come from (no uncaptures or unpromotions)
+        mover = 1 - stm
+        occupied = set(sqs)
+        for i, sq in enumerate(sqs):
+            if self.colors[i] != mover:
+                continue
+            kind = self.kinds[i]
+            origins = []
+            if kind in STEP_TARGETS:
+                origins = [fr for fr in STEP_TARGETS[kind][sq] if fr not in occupied]
+            elif kind == 'P':
+                back = -PAWN_STEP[mover]
+                fr = sq + back
+                if 0 < fr // 8 < 7 and fr not in occupied:
+                    origins.append(fr)
+                    double = fr + back
+                    if double // 8 == PAWN_START_ROW[mover] and double not in occupied:
+                        origins.append(double)
+            else:
+                for ray in SLIDER_RAYS[kind][sq]:
+                    for fr in ray:
+                        if fr in occupied:
+                            break
+                        origins.append(fr)
+
+            for fr in origins:
+                prev = list(sqs)
+                prev[i] = fr
+                yield prev
+
+# --- Probing ---
+def board_pieces(board) -> list[tuple[int, str, int]]:
+    pieces = []
+    for row in range(8):
+        for col in range(8):
+            piece = board.grid[row][col]
+            if piece:
+                color = WHITE if piece.color == Color.WHITE else BLACK
+                pieces.append((color, KIND_OF_TYPE[piece.type], row * 8 + col))
+    return pieces
+
+class Tablebases:
+    def __init__(self, directory: str):
+        self.directory = directory
+        self.tables = {}
+        self.specs = {}
+        self.available = set()
+        if os.path.isdir(directory):
+            for name in os.listdir(directory):
+                if name.endswith(FILE_SUFFIX):
+                    self.available.add(name[:-len(FILE_SUFFIX)])
+        self.max_pieces = max((len(sig) - 1 for sig in self.available), default=0)
+
+    def has_table(self, signature: str) -> bool:
+        return signature in TRIVIAL_DRAWS or signature in self.available
+
+    def add_table(self, signature: str, values):
+        self.available.add(signature)
+        self.tables[signature] = values
+        self.max_pieces = max(self.max_pieces, len(signature) - 1)
+
+    def _table(self, signature: str):
+        if signature not in self.tables:
+            path = os.path.join(self.directory, signature + FILE_SUFFIX)
+            with open(path, 'rb') as f:
+                data = f.read()
+            if data[:len(FILE_MAGIC)] != FILE_MAGIC:
+                raise ValueError(f"{path} is not a tablebase file")
+            self.tables[signature] = zlib.decompress(data[len(FILE_MAGIC):])
+        return self.tables[signature]
+
+    def probe_pieces(self, pieces: list[tuple[int, str, int]], stm: int) -> int | None:
+        white = [kind for color, kind, _ in pieces if color == WHITE]
+        black = [kind for color, kind, _ in pieces if color == BLACK]
+        signature, flipped = normalize_signature(make_signature(white, black))
+        if signature in TRIVIAL_DRAWS:
+            return DRAW
+        if signature not in self.available:
+            return None
+
+        if flipped:
+            pieces = [(1 - color, kind, sq ^ 56) for color, kind, sq in pieces]
+            stm = 1 - stm
+
+        spec = self.specs.get(signature)
+        if spec is None:
+            spec = self.specs[signature] = TableSpec(signature)
+        # Order squares as in the signature: white king, white pieces, black king, black pieces
+        order = sorted(pieces, key=lambda p: (p[0], PIECE_RANK[p[1]]))
+        return self._table(signature)[spec.index(stm, [sq for _, _, sq in order])]
+
+    def _probe_board(self, board, turn: Color) -> tuple[int, int] | None:
+        pieces = board_pieces(board)
+        if len(pieces) > self.max_pieces:
+            return None
+        value = self.probe_pieces(pieces, WHITE if turn == Color.WHITE else BLACK)
+        if value is None or value == ILLEGAL:
+            return None
+        return decode_value(value)
+
+    def probe(self, game_state) -> tuple[int, int] | None:
+        # -> (wdl, plies to mate) for the side to move, or None if not covered.
+        # Castling rights are ignored; positions with an en passant square are skipped.
+        if game_state.en_passant_target:
+            return None
+        return self._probe_board(game_state.board, game_state.current_turn)
+
+    def best_move(self, game_state):
+        if self.probe(game_state) is None:
+            return None
+
+        best_move, best_key = None, None
+        for move in game_state.get_all_legal_moves():
+            game_state.push_move(move)
+            child = self._probe_board(game_state.board, game_state.current_turn)
+            game_state.pop_move(move)
+            if child is None:
+                continue
+            wdl, plies = child
+            # Win fastest, lose slowest
+            key = (-wdl, -plies if wdl < 0 else plies if wdl > 0 else 0)
+            if best_key is None or key > best_key:
+                best_move, best_key = move, key
+        return best_move
+
+# --- Generator (retrograde analysis) ---
+def _dependencies(spec: TableSpec) -> set[str]:
+    deps = set()
+    white = [k for c, k in zip(spec.colors, spec.kinds) if c == WHITE]
+    black = [k for c, k in zip(spec.colors, spec.kinds) if c == BLACK]
+    for side, other, is_white in ((white, black, True), (black, white, False)):
+        variants = []
+        for i, kind in enumerate(side):
+            if kind == 'K':
+                continue
+            variants.append(side[:i] + side[i + 1:])  # captured
+            if kind == 'P':
+                variants += [side[:i] + [promo] + side[i + 1:] for promo in "QRBN"]
+        for variant in variants:
+            sig = make_signature(variant, other) if is_white else make_signature(other, variant)
+            deps.add(normalize_signature(sig)[0])
+    deps.discard(spec.signature)
+    return deps
+
+def _exit_value(spec: TableSpec, tablebases: Tablebases, stm: int, sqs: list[int], captured, promotion) -> int:
+    pieces = []
+    for i, sq in enumerate(sqs):
+        if i == captured:
+            continue
+        kind = spec.kinds[i]
+        if promotion and kind == 'P' and sq // 8 in (0, 7):
+            kind = promotion
+        pieces.append((spec.colors[i], kind, sq))
+    return tablebases.probe_pieces(pieces, 1 - stm)
+
+def _children(spec: TableSpec, tablebases: Tablebases, stm: int, sqs: list[int]):
+    inside, exits = [], []
+    for new_sqs, captured, promotion in spec.moves(stm, sqs):
+        if captured is None and promotion is None:
+            inside.append(spec.index(1 - stm, new_sqs))
+        else:
+            exits.append(_exit_value(spec, tablebases, stm, new_sqs, captured, promotion))
+    return inside, exits
+
+def generate_table(signature: str, directory: str, tablebases: Tablebases | None = None, verbose: bool = True) -> str:
+    signature, _ = normalize_signature(signature)
+    spec = TableSpec(signature)
+    tablebases = tablebases or Tablebases(directory)
+    os.makedirs(directory, exist_ok=True)
+
+    for dep in sorted(_dependencies(spec)):
+        if not tablebases.has_table(dep):
+            generate_table(dep, directory, tablebases, verbose)
+
+    start = time.time()
+    values = bytearray(spec.size)
+    win_candidates = defaultdict(list)   # ply -> positions winning through a capture/promotion
+    loss_candidates = defaultdict(list)  # ply -> positions whose exits all lose
+    frontier = []
+    longest = 0
+
+    for idx in range(spec.size):
+        stm, sqs = spec.decode(idx)
+        if spec.index(stm, sqs) != idx or not spec.is_legal(stm, sqs):
+            values[idx] = ILLEGAL  # Symmetric duplicates are never probed
+            continue
+        inside, exits = _children(spec, tablebases, stm, sqs)
+        if not inside and not exits:
+            if spec.in_check(stm, sqs):
+                values[idx] = LOSS_BASE
+                frontier.append(idx)
+            continue  # Stalemates stay drawn
+        losing_exits = [v - LOSS_BASE for v in exits if v >= LOSS_BASE]
+        if losing_exits:
+            win_candidates[min(losing_exits) + 1].append(idx)
+        elif exits and all(DRAW < v < LOSS_BASE for v in exits):
+            loss_candidates[max(exits) + 1].append(idx)
+
+    ply = 1
+    while frontier or win_candidates or loss_candidates:
+        if ply > MAX_PLIES:
+            raise ValueError(f"{signature}: distance to mate exceeds {MAX_PLIES} plies")
+        resolved = []
+        if ply % 2:
+            # Any move into a lost position wins
+            candidates = win_candidates.pop(ply, [])
+            for idx in frontier:
+                stm, sqs = spec.decode(idx)
+                candidates.extend(spec.index(1 - stm, prev) for prev in spec.unmoves(stm, sqs))
+            for idx in candidates:
+                if values[idx] == DRAW:
+                    values[idx] = ply
+                    resolved.append(idx)
+        else:
+            # Lost once every move leads to a won position
+            candidates = set(loss_candidates.pop(ply, []))
+            for idx in frontier:
+                stm, sqs = spec.decode(idx)
+                candidates.update(spec.index(1 - stm, prev) for prev in spec.unmoves(stm, sqs))
+            for idx in candidates:
+                if values[idx] != DRAW:
+                    continue
+                stm, sqs = spec.decode(idx)
+                inside, exits = _children(spec, tablebases, stm, sqs)
+                child_values = [values[i] for i in inside] + exits
+                if all(DRAW < v < LOSS_BASE for v in child_values) and max(child_values) == ply - 1:
+                    values[idx] = LOSS_BASE + ply
+                    resolved.append(idx)
+        if resolved:
+            longest = ply
+        frontier = resolved
+        ply += 1
+
+    path = os.path.join(directory, signature + FILE_SUFFIX)
+    with open(path, 'wb') as f:
+        f.write(FILE_MAGIC + zlib.compress(bytes(values), 9))
+    tablebases.add_table(signature, bytes(values))
+
+    if verbose:
+        print(f"✅ {signature}: {spec.size} positions, longest mate {longest} plies, {time.time() - start:.1f}s")
+    return path
+
+if __name__ == "__main__":
+    # python -m engine.tablebase generate <directory> [KQvK KRvK ...]
+    if len(sys.argv) < 3 or sys.argv[1] != "generate":
+        print("Usage: python -m engine.tablebase generate <directory> [signature ...]")
+        sys.exit(1)
+    directory = sys.argv[2]
+    tablebases = Tablebases(directory)
+    for signature in sys.argv[3:] or DEFAULT_SIGNATURES:
+        if not tablebases.has_table(normalize_signature(signature)[0]):
+            generate_table(signature, directory, tablebases)
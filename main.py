@@ -1,11 +1,33 @@
+import os
 from core.board import Board
 from core.game_state import GameState
+from core.export import line_to_san
+from engine.bot import Engine
 from engine.evaluation import evaluate_board
+from engine.search import format_score
 from ui.cli import display_board, get_user_move_input, show_message
 
+BOOK_PATH = "book.bin"
+TABLEBASE_DIR = "tablebases"
+
 def main():
     game = GameState(Board())
 
+    book = None
+    if os.path.exists(BOOK_PATH):
+        from engine.book import OpeningBook
+        book = OpeningBook(BOOK_PATH)
+        show_message(f"📖 Opening book loaded ({book.entries} entries)")
+
+    tablebases = None
+    if os.path.isdir(TABLEBASE_DIR):
+        from engine.tablebase import Tablebases
+        tablebases = Tablebases(TABLEBASE_DIR)
+        show_message(f"📚 Tablebases loaded (up to {tablebases.max_pieces} pieces)")
+
+    # Keeps its hash table between moves and ponders on the expected reply while you think
+    engine = Engine(book=book, tablebases=tablebases)
+
     while not game.is_game_over():
         display_board(game.board)
         show_message(f"{game.current_turn.name}'s move")
@@ -46,18 +68,32 @@ def main():
         if move_str == "eval":
             score = evaluate_board(game)
             show_message(f"Eval score: {score}")
+            # Top candidate moves, scores from White's point of view
+            stats = engine.think(game, time_limit=1.5, verbose=False, multipv=3)
+            for rank, (line_score, _, pv) in enumerate(stats.lines, 1):
+                show_message(f"{rank}. {format_score(line_score):>7}  {' '.join(line_to_san(game, pv))}")
             continue
 
         if move_str == "bot":
-            from engine.bot import choose_best_move_iterative
-            bot_move = choose_best_move_iterative(game, time_limit=1.5)
+            stats = engine.think(game, time_limit=1.5)
+            bot_move = stats.best_move
             if bot_move:
                 game.make_move(bot_move)
                 show_message(f"Bot played: {bot_move}")
+                engine.ponder(game, stats)
             else:
                 show_message("Bot found no legal move.")
             continue
 
+        if move_str == "profile":
+            engine.stop_pondering()
+            from engine.bot import iterative_deepening
+            from engine.profiling import format_profile
+            stats = iterative_deepening(game, time_limit=1.5, tablebases=tablebases, profile=True)
+            if stats.profile:
+                show_message(format_profile(stats.profile))
+            continue
+
         if not game.is_valid_input_format(move_str):
             show_message("Invalid format. Use e.g. 'e2e4'")
             continue
@@ -72,6 +108,7 @@ def main():
             show_message(f"Illegal move: {result}")
             continue
 
+    engine.stop_pondering()
     display_board(game.board)
     show_message("Game Over.")
 
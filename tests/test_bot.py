@@ -0,0 +1,289 @@
+# tests/test_bot.py
+import random
+from core.board import Board
+from core.game_state import GameState
+from engine.book import OpeningBook, build_book, encode_move
+
+def test_opening_book_lookup(tmp_path):
+    pgn = tmp_path / "games.pgn"
+    pgn.write_text(
+        '[Event "A"]\n[Result "1-0"]\n\n1. e4 e5 2. Nf3 {main line} Nc6 1-0\n\n'
+        '[Event "B"]\n[Result "*"]\n\n1. e4 c5 (1... e5) 2. Nf3 *\n\n'
+        '[Event "C"]\n[Result "0-1"]\n\n1. d4 d5 0-1\n'
+    )
+    book_path = tmp_path / "book.bin"
+    assert build_book([str(pgn)], str(book_path)) == 8
+
+    game = GameState(Board())
+    with OpeningBook(str(book_path)) as book:
+        moves = dict(book.lookup(game.zobrist_key()))
+        assert sorted(moves.values()) == [1, 2]
+        move = book.choose_move(game, rng=random.Random(1))
+        assert repr(move) in ("e2e4", "d2d4")
+        assert moves[encode_move(move)] > 0
+        assert book.lookup(12345) == []
+
+def test_finds_mate_in_one():
+    from core.fen import game_from_fen
+    from engine.bot import choose_best_move_iterative
+    game = game_from_fen("6k1/5ppp/8/8/8/8/5PPP/R5K1 w - - 0 1")
+    assert repr(choose_best_move_iterative(game, time_limit=0.5)) == "a1a8"
+
+    game = game_from_fen("r5k1/5ppp/8/8/8/8/5PPP/6K1 b - - 0 1")
+    assert repr(choose_best_move_iterative(game, time_limit=0.5)) == "a8a1"
+
+def test_search_stats_and_profiler():
+    from core.board import Board
+    from core.fen import game_from_fen
+    from engine.bot import iterative_deepening
+    generate = Board.generate_pseudo_legal_moves
+    game = game_from_fen("6k1/5ppp/8/8/8/8/5PPP/R5K1 w - - 0 1")
+    stats = iterative_deepening(game, max_depth=2, profile=True)
+    assert [it["depth"] for it in stats.iterations] == [1, 2]
+    assert stats.nodes > 0 and stats.qnodes > 0
+    assert repr(stats.pv[0]) == "a1a8" and stats.pv[0] is stats.best_move
+    assert stats.as_dict()["move"] == "a1a8"
+    assert stats.profile["core.board.Board.generate_pseudo_legal_moves"][0] > 0
+    assert Board.generate_pseudo_legal_moves is generate
+
+def test_bench_signature_and_regression_check(tmp_path):
+    from engine.bench import BENCH_POSITIONS, compare_bench, load_bench, run_bench, save_bench
+    positions = BENCH_POSITIONS[-4:]
+    report = run_bench(depth=2, positions=positions, verbose=False)
+    assert report["nodes"] == sum(r["nodes"] for r in report["results"]) > 0
+    save_bench(report, tmp_path / "bench.json")
+    baseline = load_bench(tmp_path / "bench.json")
+    assert run_bench(depth=2, positions=positions, verbose=False)["nodes"] == baseline["nodes"]
+
+    assert compare_bench(baseline, dict(report, nps=baseline["nps"])) == []
+    assert any("NPS" in p for p in compare_bench(baseline, dict(report, nps=baseline["nps"] // 2)))
+    assert any("signature" in p for p in compare_bench(baseline, dict(report, nodes=report["nodes"] + 1)))
+    assert "not comparable" in compare_bench(baseline, dict(report, depth=3))[0]
+
+def test_match_game_pgn_and_statistics():
+    from engine.match import EngineConfig, MatchStats, game_to_pgn, play_game
+    fast = EngineConfig("fast", max_depth=1)
+    slow = EngineConfig("slow", max_depth=1, weights={"MOBILITY_WEIGHT": 0})
+    game = play_game(slow, fast, "6k1/5ppp/8/8/8/8/r4PPP/6K1 b - - 0 30")
+    assert game["moves"] == ["Ra1#"]
+    assert (game["result"], game["termination"]) == ("0-1", "checkmate")
+    pgn = game_to_pgn(game, 1)
+    assert '[FEN "6k1/5ppp/8/8/8/8/r4PPP/6K1 b - - 0 30"]' in pgn
+    assert pgn.endswith("30... Ra1# 0-1\n\n")
+
+    stats = MatchStats(elo0=0, elo1=10)
+    for points in [1] * 600 + [0] * 400:
+        stats.record(points)
+    assert round(stats.elo) == 70 and stats.elo_margin > 0
+    assert stats.sprt == "H1"
+    for points in [0] * 2000:
+        stats.record(points)
+    assert stats.sprt == "H0"
+
+    import pytest
+    for name in ("NO_SUCH_WEIGHT", "MAX_PHASE"):  # table inputs are not overridable either
+        with pytest.raises(ValueError):
+            EngineConfig("bad", weights={name: 1})
+
+def test_server_sessions_and_bot_replies():
+    import asyncio
+    from ui.server import GameServer
+
+    async def scenario():
+        server = GameServer(workers=1)
+        events = asyncio.Queue()
+        try:
+            game = await server.handle({"cmd": "new", "bot": "black", "depth": 1, "id": 7}, events.put)
+            assert game["ok"] and game["id"] == 7 and game["turn"] == "white"
+            session = game["session"]
+
+            reply = await server.handle({"cmd": "move", "session": session, "move": "e4"}, events.put)
+            assert (reply["move"], reply["san"]) == ("e2e4", "e4")
+            assert not (await server.handle({"cmd": "move", "session": session, "move": "d4"}, events.put))["ok"]
+            event = await asyncio.wait_for(events.get(), 30)
+            assert event["event"] == "move" and event["session"] == session
+
+            state = await server.handle({"cmd": "state", "session": session}, events.put)
+            assert state["moves"] == ["e2e4", event["move"]] and not state["thinking"]
+
+            # A move sent while "go" is searching is refused; the search result still applies
+            assert (await server.handle({"cmd": "go", "session": session}, events.put))["ok"]
+            reply = await server.handle({"cmd": "move", "session": session, "move": "d4"}, events.put)
+            assert reply == {"ok": False, "error": "Bot is thinking"}
+            event = await asyncio.wait_for(events.get(), 30)
+            assert event["event"] == "move"
+            state = await server.handle({"cmd": "state", "session": session}, events.put)
+            assert len(state["moves"]) == 3 and state["thinking"]  # bot (black) replies to its own move
+            await asyncio.wait_for(events.get(), 30)
+
+            # Malformed setups are refused without dropping the connection
+            for bad in ({"fen": ""}, {"fen": "rnbqkbnr/pppppppp/8/8/8/8/PPPPPPPP/RNBQKBNRR w - - 0 1"},
+                        {"fen": "8/8/8/8/8/8/8/8 w - - 0 1"}, {"depth": "3"}, {"time": 0}, {"clock": -5}):
+                reply = await server.handle({"cmd": "new", "bot": "none", **bad}, events.put)
+                assert not reply["ok"] and reply["error"].startswith("Invalid"), bad
+
+            flagged = await server.handle({"cmd": "new", "bot": "none", "clock": 0.01}, events.put)
+            await asyncio.sleep(0.05)
+            state = await server.handle({"cmd": "state", "session": flagged["session"]}, events.put)
+            assert (state["result"], state["reason"]) == ("0-1", "time forfeit")
+
+            assert (await server.handle({"cmd": "close", "session": session}, events.put))["ok"]
+            assert not (await server.handle({"cmd": "state", "session": session}, events.put))["ok"]
+        finally:
+            server.close()
+
+    asyncio.run(scenario())
+
+def test_engine_reuses_hash_table_and_ponders():
+    import time
+    from core.fen import game_from_fen, game_to_fen
+    from engine.bot import Engine
+    engine = Engine()
+    game = game_from_fen("r1bqkbnr/pppp1ppp/2n5/4p3/4P3/5N2/PPPP1PPP/RNBQKB1R w KQkq - 2 3")
+    cold = engine.think(game, max_depth=2, verbose=False)
+    warm = engine.think(game, max_depth=2, verbose=False)
+    assert warm.tt_hits > 0 and warm.total_nodes < cold.total_nodes
+    assert repr(warm.best_move) == repr(cold.best_move)
+
+    game.make_move(warm.best_move, silent=True)
+    reply = engine.ponder(game, warm)
+    assert reply is not None and engine.pondering
+    time.sleep(0.5)
+    game.make_move(reply, silent=True)
+    hit = engine.think(game, time_limit=0.2, verbose=False)
+    assert hit.source == "ponder" and hit.best_move and engine.pondering is None
+
+    # Ponder miss: the background search is stopped and the position left untouched
+    game.make_move(hit.best_move, silent=True)
+    engine.ponder(game, hit)
+    other = next(m for m in game.get_all_legal_moves() if repr(m) != repr(engine.expected_reply(game, hit)))
+    game.make_move(other, silent=True)
+    fen, keys = game_to_fen(game), list(game.hash_stack)
+    stats = engine.think(game, time_limit=0.2, verbose=False)
+    assert stats.source == "search" and stats.best_move
+    assert (game_to_fen(game), game.hash_stack) == (fen, keys)
+
+def test_multipv_ranks_distinct_root_moves():
+    from core.export import line_to_san
+    from core.fen import game_from_fen
+    from engine.bot import analyse
+    from engine.search import format_score
+    game = game_from_fen("r1bqkb1r/pppp1ppp/2n2n2/4p2Q/2B1P3/8/PPPP1PPP/RNB1K1NR w KQkq - 4 4")
+    lines = analyse(game, multipv=3, max_depth=2)
+    assert len(lines) == 3 and len({repr(move) for _, move, _ in lines}) == 3
+    assert line_to_san(game, lines[0][2]) == ["Qxf7#"] and format_score(lines[0][0]) == "#1"
+    assert all(pv[0] is move and len(pv) >= 1 for _, move, pv in lines)
+    assert lines[0][0] >= lines[1][0] >= lines[2][0]
+
+    # Black to move: best is the lowest White-relative score; fewer legal moves than requested
+    game = game_from_fen("7k/8/8/8/8/8/r7/K7 b - - 0 1")
+    lines = analyse(game, multipv=30, max_depth=1)
+    assert len(lines) == len(game.get_all_legal_moves())
+    assert [score for score, _, _ in lines] == sorted(score for score, _, _ in lines)
+
+def test_eval_cache_verifies_keys_and_matches_uncached_search():
+    from core.fen import game_from_fen
+    from engine.bot import iterative_deepening
+    from engine.evaluation import EvalCache
+    from engine.search import SearchContext, TranspositionTable
+    cache = EvalCache(1000)
+    assert len(cache) == 1024
+    cache.store(5, -42)
+    assert cache.probe(5) == -42 and cache.probe(5 + 1024) is None  # same slot, different key
+    cache.store(5 + 1024, 17)  # always-replace
+    assert cache.probe(5) is None and cache.probe(5 + 1024) == 17
+    assert (cache.hits, cache.misses) == (2, 2)
+
+    fen = "r1bq1rk1/pp3ppp/2n1pn2/2pp4/3P4/2PBPN2/P4PPP/R1BQ1RK1 b - - 0 9"
+    results = []
+    for cache in (None, EvalCache()):
+        context = SearchContext(tt=TranspositionTable(), eval_cache=cache)
+        stats = iterative_deepening(game_from_fen(fen), None, 2, verbose=False, context=context)
+        results.append((repr(stats.best_move), stats.score, stats.total_nodes))
+    assert results[0] == results[1]
+    assert cache.hits > 0 and cache.hits + cache.misses <= results[1][2]
+
+def test_tablebase_generation_and_probe(tmp_path):
+    from core.fen import game_from_fen
+    from engine.tablebase import Tablebases, generate_table
+    generate_table("KQvK", str(tmp_path), verbose=False)
+    tablebases = Tablebases(str(tmp_path))
+    assert tablebases.max_pieces == 3
+
+    # Mate in one for White, already mated, and the same material with colours reversed
+    game = game_from_fen("7k/8/6K1/8/8/8/8/1Q6 w - - 0 1")
+    assert tablebases.probe(game) == (1, 1)
+    assert repr(tablebases.best_move(game)) in ("b1b8", "b1h7")
+    assert tablebases.probe(game_from_fen("1Q5k/8/6K1/8/8/8/8/8 b - - 0 1")) == (-1, 0)
+    assert tablebases.probe(game_from_fen("8/8/1q6/8/8/6k1/8/7K b - - 0 1"))[0] == 1
+
+    # Queen hangs to the king with Black to move: drawn
+    assert tablebases.probe(game_from_fen("8/8/8/8/8/8/6Qk/K7 b - - 0 1")) == (0, 0)
+
+def test_batch_evaluation_matches_static_score():
+    import pytest
+    np = pytest.importorskip("numpy")
+    from core.fen import game_from_fen
+    from engine.batch_evaluation import evaluate_children, evaluate_positions, encode_positions, evaluate_static_batch
+    from engine.evaluation import static_score
+
+    games = [game_from_fen(fen) for fen in (
+        "rnbqkbnr/pppppppp/8/8/8/8/PPPPPPPP/RNBQKBNR w KQkq - 0 1",
+        "r1bq1rk1/pp3ppp/2n1pn2/2pp4/3P4/2PBPN2/P4PPP/R1BQ1RK1 b - - 0 9",
+        "8/2p5/1P1p4/K2P3r/1R3p1k/8/4P1P1/8 w - - 0 1",
+        "6k1/P4p2/6p1/3P4/8/2pp4/5PP1/6K1 b - - 0 1",
+    )]
+    codes, white_to_move = encode_positions(games)
+    assert codes.shape == (4, 64) and codes.dtype == np.int8
+    static = [static_score(g.board) for g in games]
+    assert list(evaluate_static_batch(codes)) == static
+    assert list(evaluate_positions(games)) == [s if white else -s for s, white in zip(static, white_to_move)]
+
+    game = games[1]
+    moves = game.get_all_legal_moves()
+    expected = []
+    for move in moves:
+        game.push_move(move)
+        expected.append(-static_score(game.board))
+        game.pop_move(move)
+    assert list(evaluate_children(game, moves)) == expected
+
+def test_batch_evaluation_falls_back_without_numpy(monkeypatch):
+    import pytest
+    from core.fen import game_from_fen
+    from engine import batch_evaluation
+    from engine.evaluation import static_score
+    monkeypatch.setattr(batch_evaluation, "np", None)
+    game = game_from_fen("r1bq1rk1/pp3ppp/2n1pn2/2pp4/3P4/2PBPN2/P4PPP/R1BQ1RK1 b - - 0 9")
+    assert batch_evaluation.evaluate_positions([game]) == [-static_score(game.board)]
+    move = game.get_all_legal_moves()[0]
+    game.push_move(move)
+    expected = -static_score(game.board)
+    game.pop_move(move)
+    assert batch_evaluation.evaluate_children(game, [move]) == [expected]
+    with pytest.raises(ImportError):
+        batch_evaluation.encode_positions([game])
+
+def test_incremental_scores_match_full_recompute():
+    from core.fen import game_from_fen
+    from engine.evaluation import MAX_PHASE
+    # Castling, en passant and promotion all available within a few plies
+    game = game_from_fen("r3k2r/pPppqpb1/bn2pnp1/3PN3/1p2P3/2N2Q1p/PPPBBPPP/R3K2R w KQkq - 0 1")
+    rng = random.Random(7)
+    played = []
+    for _ in range(40):
+        moves = game.get_all_legal_moves()
+        if not moves:
+            break
+        special = [m for m in moves if m.castling or m.promotion or m.captured_pos != m.to_pos]
+        move = rng.choice(special or moves)
+        game.push_move(move)
+        played.append(move)
+        scores = (game.board.mg_score, game.board.eg_score, game.board.phase)
+        game.board.refresh_scores()
+        assert scores == (game.board.mg_score, game.board.eg_score, game.board.phase)
+    for move in reversed(played):
+        game.pop_move(move)
+    start = game_from_fen("r3k2r/pPppqpb1/bn2pnp1/3PN3/1p2P3/2N2Q1p/PPPBBPPP/R3K2R w KQkq - 0 1")
+    assert (game.board.mg_score, game.board.eg_score) == (start.board.mg_score, start.board.eg_score)
+    assert 0 < start.board.phase <= MAX_PHASE
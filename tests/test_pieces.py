@@ -6,3 +6,13 @@ def test_piece_symbol():
     assert p.symbol() == 'R'
     p2 = Piece(Color.BLACK, PieceType.KNIGHT)
     assert p2.symbol() == 'n'
+
+def test_pieces_are_shared_and_immutable():
+    import copy
+    import pytest
+    from core.piece import PIECES
+    assert Piece(Color.WHITE, PieceType.ROOK) is Piece(Color.WHITE, PieceType.ROOK)
+    assert len({id(p) for p in PIECES}) == 12 and all(p.index == i for i, p in enumerate(PIECES))
+    assert copy.deepcopy(PIECES[3]) is PIECES[3]
+    with pytest.raises(AttributeError):
+        PIECES[0].color = Color.BLACK
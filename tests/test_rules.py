@@ -0,0 +1,94 @@
+# tests/test_rules.py
+from core.board import ALL_CASTLING, Board
+from core.game_state import GameState, san_to_coords
+
+def play(game, *sans):
+    for san in sans:
+        move = san_to_coords(san, game)
+        assert move is not None, san
+        ok, _ = game.make_move(move, silent=True)
+        assert ok, san
+
+def test_castling_moves_rook_and_undo_restores():
+    game = GameState(Board())
+    play(game, "e4", "e5", "Nf3", "Nf6", "Bc4", "Bc5", "O-O")
+    assert game.board.grid[7][6].symbol() == 'K'
+    assert game.board.grid[7][5].symbol() == 'R'
+    assert game.board.grid[7][7] is None
+
+    assert game.undo_last_move()
+    assert game.board.grid[7][4].symbol() == 'K'
+    assert game.board.grid[7][7].symbol() == 'R'
+    assert game.board.castling_rights() == ALL_CASTLING
+
+def test_disambiguated_san():
+    game = GameState(Board())
+    play(game, "Nf3", "Nf6", "d3", "d6", "Nbd2+")
+    assert game.board.grid[6][3].symbol() == 'N'
+
+def test_san_export_disambiguates_and_marks_check():
+    from core.export import move_to_san
+    from core.fen import game_from_fen
+    game = game_from_fen("4k3/8/8/8/8/8/4K3/R6R w - - 0 1")
+    sans = sorted(move_to_san(m, game) for m in game.get_all_legal_moves() if m.to_pos == (7, 3))
+    assert sans == ["Kd1", "Rad1", "Rhd1"]
+    game = game_from_fen("4k3/8/8/8/8/8/8/R3K2R w - - 0 1")
+    assert any(move_to_san(m, game) == "Rh8+" for m in game.get_all_legal_moves())
+
+def test_incremental_hash_matches_full_recompute():
+    from core.fen import game_from_fen
+    from core.zobrist import compute_hash
+    game = game_from_fen("r3k2r/1P6/8/3pP3/8/8/8/R3K2R w KQkq d6 0 1")
+    for move in game.get_all_legal_moves():
+        game.push_move(move)
+        assert game.zobrist_key() == compute_hash(game.board, game.current_turn, game.en_passant_target)
+        game.pop_move(move)
+    assert game.hash_stack == [compute_hash(game.board, game.current_turn, game.en_passant_target)]
+
+def test_repetition_fifty_move_and_material_draws():
+    from core.fen import game_from_fen
+    game = GameState(Board())
+    play(game, "Nf3", "Nf6", "Ng1", "Ng8")
+    assert game.game_result() is None
+    assert not game.is_repetition() and game.is_repetition(ply=5)  # once is enough inside a search
+    play(game, "Nf3", "Nf6", "Ng1", "Ng8")
+    assert game.game_result() == ("1/2-1/2", "threefold repetition")
+    assert game.undo_last_move() and game.game_result() is None
+
+    assert game_from_fen("8/8/4k3/8/8/2N5/8/4K3 w - - 0 1").game_result() == ("1/2-1/2", "insufficient material")
+    assert game_from_fen("8/8/4k3/8/8/2R5/8/4K3 w - - 0 1").game_result() is None
+    assert game_from_fen("8/8/4k3/8/8/2R5/8/4K3 w - - 100 80").game_result() == ("1/2-1/2", "fifty-move rule")
+
+    # Mate on the hundredth half-move is not a fifty-move draw, also for the search
+    game = game_from_fen("6k1/5ppp/8/8/8/8/8/R5K1 w - - 99 80")
+    play(game, "Ra8#")
+    assert game.halfmove_clock == 100 and not game.is_draw(ply=1)
+    assert game.game_result() == ("1-0", "checkmate")
+    assert game_from_fen("8/8/4k3/8/8/2R5/8/4K3 w - - 100 80").is_draw(ply=1)
+
+def test_castling_rights_tracked_by_board_and_mailbox_round_trip():
+    from core.board import WHITE_KINGSIDE, WHITE_QUEENSIDE, BLACK_QUEENSIDE
+    from core.fen import game_from_fen, game_to_fen
+    game = game_from_fen("r3k2r/1P6/8/8/8/8/8/R3K2R w KQkq - 0 1")
+    play(game, "bxa8=Q+")  # capturing the rook on its corner removes Black's queenside right
+    assert game.board.castling_rights() == ALL_CASTLING & ~BLACK_QUEENSIDE
+    play(game, "Kd7", "Rh2")
+    assert game.board.castling_rights() == WHITE_QUEENSIDE and game.board.find_king(game.current_turn) == (1, 3)
+    assert game.undo_last_move() and game.undo_last_move()
+    assert game.board.castling_rights() & WHITE_KINGSIDE and game.board.find_king(game.current_turn) == (0, 4)
+
+    mailbox = game.board.to_mailbox()
+    assert isinstance(mailbox, bytearray) and len(mailbox) == 64
+    board = Board.from_mailbox(mailbox, game.board.castling_rights())
+    assert board.grid == game.board.grid
+    assert (board.piece_hash, board.find_king(game.current_turn)) == (game.board.piece_hash, (0, 4))
+    fen = game_to_fen(game)
+    assert game_to_fen(game_from_fen(fen)) == fen
+
+def test_malformed_fen_raises_value_error():
+    import pytest
+    from core.fen import game_from_fen
+    for fen in ("", "rnbqkbnr/pppppppp/8/8/8/8/PPPPPPPP/RNBQKBNRR w - - 0 1", "8/8/8/8/8/8/8 w - - 0 1",
+                "4k3/8/8/8/8/8/8/4K3 x - - 0 1", "4k3/8/8/8/8/8/8/4KX2 w - - 0 1", "4k3/8/8/8/8/8/8/8 w - - 0 1"):
+        with pytest.raises(ValueError):
+            game_from_fen(fen)
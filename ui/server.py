@@ -0,0 +1,338 @@
+import argparse
+import asyncio
+import json
+import math
+import sys
+import time
+import uuid
+from concurrent.futures import ProcessPoolExecutor
+
+from core.export import move_to_san
+from core.fen import START_FEN, game_from_fen, game_to_fen
+from core.game_state import san_to_coords
+from core.piece import Color
+
+# JSON-lines protocol, one object per line in each direction. Requests carry "cmd"
+# (and an optional "id" echoed in the reply); the server also pushes "event" objects
+# when the bot moves or a game ends.
+#
+#   {"cmd": "new", "bot": "black", "time": 1.0, "clock": 300, "increment": 2}
+#   {"cmd": "move", "session": "<id>", "move": "e2e4"}        (UCI or SAN)
+#   {"cmd": "go" | "state" | "cancel" | "close", "session": "<id>"}
+
+MAX_SESSIONS = 1000
+BOT_SIDES = {
+    "white": {Color.WHITE},
+    "black": {Color.BLACK},
+    "both": {Color.WHITE, Color.BLACK},
+    "none": set(),
+}
+
+# --- Worker Side (runs in the process pool) ---
+_book = _tablebases = None
+
+def _init_worker(book_path, tablebase_dir):
+    global _book, _tablebases
+    if book_path:
+        from engine.book import OpeningBook
+        _book = OpeningBook(book_path)
+    if tablebase_dir:
+        from engine.tablebase import Tablebases
+        _tablebases = Tablebases(tablebase_dir)
+
+def find_move(game_state, text: str):
+    # Legal move matching UCI ("e7e8q", a bare "e7e8" promotes to a queen) or SAN ("Nf3"), or None
+    legal = {move.uci(): move for move in game_state.get_all_legal_moves()}
+    return legal.get(text) or legal.get(text + "q") or san_to_coords(text, game_state)
+
+def search_position(start_fen, moves, time_limit, max_depth=None):
+    # Rebuilds the game (so the search sees its repetition history) and returns (uci, score)
+    from engine.bot import iterative_deepening
+    game = game_from_fen(start_fen)
+    for uci in moves:
+        game.push_move(find_move(game, uci))
+    stats = iterative_deepening(game, time_limit, max_depth, _book, _tablebases, verbose=False)
+    return (stats.best_move.uci() if stats.best_move else None), stats.score
+
+def _number(request, key, default, cast, allow_zero=False):
+    # Optional positive numeric field of a request; None (the default for limits) means unlimited
+    value = request.get(key, default)
+    if value is None:
+        return None
+    if isinstance(value, bool) or not isinstance(value, (int, float)):
+        raise ValueError(f"Invalid {key}: {value!r}")
+    value = cast(value)
+    if not math.isfinite(value) or value < 0 or (value == 0 and not allow_zero):
+        raise ValueError(f"Invalid {key}: {value!r}")
+    return value
+
+# --- Sessions ---
+class GameSession:
+    def __init__(self, session_id, game, send, bots=(), move_time=1.0, max_depth=None, clock=None, increment=0.0):
+        self.id = session_id
+        self.game = game
+        self.start_fen = game_to_fen(game)
+        self.send = send                  # coroutine pushing events to the owning client
+        self.bots = set(bots)
+        self.move_time = move_time
+        self.max_depth = max_depth
+        self.clocks = {Color.WHITE: clock, Color.BLACK: clock} if clock else None
+        self.increment = increment
+        self.turn_started = time.monotonic()
+        self.search = None                # asyncio.Task while the bot is thinking
+        self.result = None                # (result, reason) once finished
+
+    def remaining(self, color) -> float | None:
+        if not self.clocks:
+            return None
+        left = self.clocks[color]
+        if color == self.game.current_turn and not self.result:
+            left -= time.monotonic() - self.turn_started
+        return max(left, 0.0)
+
+    def check_flag(self) -> bool:
+        # Lazily ends the game when the side to move has run out of time
+        if not self.result and self.clocks and self.remaining(self.game.current_turn) <= 0:
+            loser = self.game.current_turn
+            self.result = ("0-1" if loser == Color.WHITE else "1-0"), "time forfeit"
+        return self.result is not None
+
+    def bot_time(self) -> float:
+        if not self.clocks:
+            return self.move_time
+        # Spend about 1/30 of the remaining clock plus most of the increment
+        budget = self.remaining(self.game.current_turn) / 30 + self.increment * 0.8
+        return max(0.05, min(self.move_time, budget))
+
+    def play(self, move) -> str:
+        color = self.game.current_turn
+        if self.clocks:
+            self.clocks[color] = self.remaining(color) + self.increment
+        san = move_to_san(move, self.game)
+        self.game.make_move(move, silent=True)
+        self.turn_started = time.monotonic()
+        self.result = self.game.game_result()
+        return san
+
+    def state(self) -> dict:
+        self.check_flag()
+        return {
+            "session": self.id,
+            "fen": game_to_fen(self.game),
+            "moves": [m.uci() for m in self.game.move_history],
+            "turn": self.game.current_turn.name.lower(),
+            "clock": {c.name.lower(): self.remaining(c) for c in (Color.WHITE, Color.BLACK)} if self.clocks else None,
+            "thinking": self.search is not None,
+            "result": self.result[0] if self.result else None,
+            "reason": self.result[1] if self.result else None,
+        }
+
+# --- Server ---
+class GameServer:
+    # Hosts any number of sessions on one event loop; searches run in a bounded
+    # process pool so a slow search never blocks other games.
+    def __init__(self, workers=2, max_sessions=MAX_SESSIONS, book=None, tablebases=None):
+        self.sessions = {}
+        self.max_sessions = max_sessions
+        self.executor = ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(book, tablebases))
+
+    def close(self):
+        for session in list(self.sessions.values()):
+            self._cancel(session)
+        self.sessions.clear()
+        self.executor.shutdown(wait=False, cancel_futures=True)
+
+    async def handle(self, request: dict, send) -> dict:
+        try:
+            reply = await self._dispatch(request, send)
+        except (KeyError, ValueError, TypeError) as e:
+            reply = {"ok": False, "error": str(e)}
+        if "id" in request:
+            reply["id"] = request["id"]
+        return reply
+
+    async def _dispatch(self, request, send) -> dict:
+        cmd = request.get("cmd")
+        if cmd == "new":
+            return self._new(request, send)
+
+        session = self.sessions.get(request.get("session"))
+        if session is None:
+            raise ValueError("Unknown session")
+
+        if cmd == "move":
+            if session.check_flag():
+                raise ValueError("Game is over")
+            if session.game.current_turn in session.bots:
+                raise ValueError("Not your turn")
+            if session.search is not None:
+                raise ValueError("Bot is thinking")
+            move = find_move(session.game, request["move"])
+            if move is None:
+                raise ValueError(f"Illegal move: {request['move']}")
+            san = session.play(move)
+            self._continue(session)
+            return {"ok": True, "move": move.uci(), "san": san, **self._result(session)}
+
+        if cmd == "go":
+            # Bot plays the side to move, whoever controls it
+            if session.check_flag():
+                raise ValueError("Game is over")
+            if session.search is None:
+                session.search = asyncio.create_task(self._bot_move(session))
+            return {"ok": True}
+
+        if cmd == "state":
+            return {"ok": True, **session.state()}
+
+        if cmd == "cancel":
+            return {"ok": True, "cancelled": self._cancel(session)}
+
+        if cmd == "close":
+            self._cancel(session)
+            del self.sessions[session.id]
+            return {"ok": True}
+
+        raise ValueError(f"Unknown command: {cmd}")
+
+    def _new(self, request, send) -> dict:
+        if len(self.sessions) >= self.max_sessions:
+            raise ValueError("Server is full")
+        fen = request.get("fen", START_FEN)
+        if not isinstance(fen, str):
+            raise ValueError("Invalid FEN")
+        try:
+            game = game_from_fen(fen)
+        except (IndexError, KeyError, ValueError) as e:
+            raise ValueError(f"Invalid FEN: {e}") from None
+        if request.get("bot", "black") not in BOT_SIDES:
+            raise ValueError(f"Invalid bot side: {request['bot']}")
+        session = GameSession(
+            uuid.uuid4().hex[:12], game, send,
+            bots=BOT_SIDES[request.get("bot", "black")],
+            move_time=_number(request, "time", 1.0, float),
+            max_depth=_number(request, "depth", None, int),
+            clock=_number(request, "clock", None, float),
+            increment=_number(request, "increment", 0.0, float, allow_zero=True),
+        )
+        self.sessions[session.id] = session
+        self._continue(session)
+        return {"ok": True, **session.state()}
+
+    def _result(self, session) -> dict:
+        return {"result": session.result[0], "reason": session.result[1]} if session.result else {}
+
+    def _continue(self, session):
+        # Start the bot's search if it is to move
+        if not session.result and session.search is None and session.game.current_turn in session.bots:
+            session.search = asyncio.create_task(self._bot_move(session))
+
+    def _cancel(self, session) -> bool:
+        # A search already running in a worker finishes there; its result is dropped
+        if session.search is None:
+            return False
+        session.search.cancel()
+        session.search = None
+        return True
+
+    async def _bot_move(self, session):
+        loop = asyncio.get_running_loop()
+        task = asyncio.current_task()
+        key = session.game.zobrist_key()  # the searched position; a result for any other is dropped
+        moves = [m.uci() for m in session.game.move_history]
+        try:
+            uci, score = await loop.run_in_executor(
+                self.executor, search_position, session.start_fen, moves, session.bot_time(), session.max_depth
+            )
+            if session.search is not task or session.game.zobrist_key() != key:
+                return
+            session.search = None
+            if session.check_flag():
+                await session.send({"event": "game_over", "session": session.id, **self._result(session)})
+                return
+
+            move = find_move(session.game, uci)
+            if move is None:
+                raise ValueError(f"Search returned an illegal move: {uci}")
+            san = session.play(move)
+            await session.send({
+                "event": "move", "session": session.id, "move": uci, "san": san,
+                "score": score, "fen": game_to_fen(session.game),
+            })
+            if session.result:
+                await session.send({"event": "game_over", "session": session.id, **self._result(session)})
+            self._continue(session)
+        except Exception as e:
+            await session.send({"event": "error", "session": session.id, "error": f"{type(e).__name__}: {e}"})
+        finally:
+            if session.search is task:
+                session.search = None
+
+    async def serve_lines(self, reader, write):
+        # One client: requests from `reader`, replies and events through `write(dict)`
+        owned = set()
+        try:
+            async for line in reader:
+                if not line.strip():
+                    continue
+                try:
+                    request = json.loads(line)
+                except json.JSONDecodeError:
+                    await write({"ok": False, "error": "Invalid JSON"})
+                    continue
+                reply = await self.handle(request, write)
+                if request.get("cmd") == "new" and reply.get("ok"):
+                    owned.add(reply["session"])
+                await write(reply)
+        finally:
+            # Sessions die with their client
+            for session_id in owned:
+                session = self.sessions.pop(session_id, None)
+                if session:
+                    self._cancel(session)
+
+    async def serve_tcp(self, host="127.0.0.1", port=8765):
+        async def client(reader, writer):
+            async def write(message):
+                if not writer.is_closing():
+                    writer.write((json.dumps(message) + "\n").encode())
+                    await writer.drain()
+            try:
+                await self.serve_lines(reader, write)
+            finally:
+                writer.close()
+
+        server = await asyncio.start_server(client, host, port)
+        print(f"♟️ Serving on {', '.join(str(s.getsockname()) for s in server.sockets)}")
+        async with server:
+            await server.serve_forever()
+
+    async def serve_stdio(self):
+        loop = asyncio.get_running_loop()
+        reader = asyncio.StreamReader()
+        await loop.connect_read_pipe(lambda: asyncio.StreamReaderProtocol(reader), sys.stdin)
+
+        async def write(message):
+            print(json.dumps(message), flush=True)
+
+        await self.serve_lines(reader, write)
+
+if __name__ == "__main__":
+    # python -m ui.server [--port 8765 | --stdio] [--workers 4]
+    parser = argparse.ArgumentParser(description="Multi-game chess server (JSON lines)")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--stdio", action="store_true", help="speak the protocol on stdin/stdout instead of TCP")
+    parser.add_argument("--workers", type=int, default=2, help="search processes")
+    parser.add_argument("--max-sessions", type=int, default=MAX_SESSIONS)
+    parser.add_argument("--book")
+    parser.add_argument("--tablebases")
+    args = parser.parse_args()
+
+    game_server = GameServer(args.workers, args.max_sessions, args.book, args.tablebases)
+    try:
+        asyncio.run(game_server.serve_stdio() if args.stdio else game_server.serve_tcp(args.host, args.port))
+    except KeyboardInterrupt:
+        pass
+    finally:
+        game_server.close()